@@ -21,16 +21,21 @@ References:
 __version__ = "2.12.0"
 
 import argparse
+import atexit
 import concurrent.futures as futures
+import contextlib
+import functools
 import hashlib
+import itertools
 import json
+import mmap
 import os
 import re
 import shutil
-import signal
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 from collections import Counter
 from datetime import datetime
@@ -83,8 +88,11 @@ COMMAND_TIMEOUTS = {
     "debug_snapshots": 20,
     "debug_inspect": 60,
 }
-DATASTORE_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+DATASTORE_NAME_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-"
+)
 
+_DATASTORE_PATH_CACHE: Dict[str, str] = {}
 _SNAPSHOT_LIST_CACHE: Dict[Tuple[str, str], Optional[List[Dict[str, Any]]]] = {}
 _GUEST_COMMENT_CACHE: Dict[Tuple[str, str, str, str], Optional[str]] = {}
 GUEST_COMMENT_MAXLEN = 48
@@ -189,6 +197,10 @@ GITHUB_RAW_TEMPLATE = (
 )
 
 
+_DIGITS = re.compile(r"\d+")
+
+
+@functools.lru_cache(maxsize=64)
 def _parse_version_str(s: str) -> Tuple[int, ...]:
     """Parse version string into a comparable tuple of ints.
 
@@ -198,46 +210,110 @@ def _parse_version_str(s: str) -> Tuple[int, ...]:
     s = (s or "").strip()
     if s.startswith(("v", "V")):
         s = s[1:]
-    parts = re.findall(r"\d+", s)
+    parts = _DIGITS.findall(s)
     return tuple(int(p) for p in parts) if parts else (0,)
 
 
 def _is_remote_newer(remote: str, current: str) -> bool:
     ra = _parse_version_str(remote)
     ca = _parse_version_str(current)
-    n = max(len(ra), len(ca))
-    ra = ra + (0,) * (n - len(ra))
-    ca = ca + (0,) * (n - len(ca))
-    return ra > ca
+    # Missing trailing parts count as 0, so '2.5' == '2.5.0'.
+    for r, c in itertools.zip_longest(ra, ca, fillvalue=0):
+        if r != c:
+            return r > c
+    return False
+
+
+_HTTPS_OPENER: Optional[urllib.request.OpenerDirector] = None
+
+
+def _https_opener() -> urllib.request.OpenerDirector:
+    """Return the shared URL opener, creating its TLS context on first use."""
+    global _HTTPS_OPENER
+    if _HTTPS_OPENER is None:
+        # Use default SSL context for secure TLS; loading the CA store is the
+        # expensive part, so it is done once per process.
+        ctx = ssl.create_default_context()
+        _HTTPS_OPENER = urllib.request.build_opener(
+            urllib.request.HTTPSHandler(context=ctx)
+        )
+    return _HTTPS_OPENER
+
+
+def _http_open(url: str, timeout: float, extra_headers: Optional[Dict[str, str]] = None):
+    """Open url through the shared opener; the caller reads and closes the response."""
+    headers = {
+        "User-Agent": f"{REPO_NAME}/{__version__}",
+        "Accept": (
+            "application/vnd.github+json, "
+            "application/json;q=0.9, */*;q=0.8"
+        ),
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+    req = urllib.request.Request(url, headers=headers)
+    return _https_opener().open(req, timeout=timeout)
 
 
 def _http_request(url: str, timeout: float) -> bytes:
+    with _http_open(url, timeout) as resp:
+        return resp.read()
+
+
+def _http_head(url: str, timeout: float) -> Optional[int]:
+    """Return the HTTP status of a HEAD request for url, or None on failure."""
     req = urllib.request.Request(
         url,
-        headers={
-            "User-Agent": f"{REPO_NAME}/{__version__}",
-            "Accept": (
-                "application/vnd.github+json, "
-                "application/json;q=0.9, */*;q=0.8"
-            ),
-        },
+        headers={"User-Agent": f"{REPO_NAME}/{__version__}"},
+        method="HEAD",
     )
-    # Use default SSL context for secure TLS
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, timeout=timeout, context=ctx) as resp:
-        return resp.read()
+    try:
+        with _https_opener().open(req, timeout=timeout) as resp:
+            return resp.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except Exception:
+        return None
+
+
+_RELEASE_INFO_TTL = 300.0  # seconds a successful release lookup is reused
+# (fetched_at, info, etag); the ETag allows a cheap 304 revalidation once the TTL expires.
+_RELEASE_INFO_CACHE: Optional[Tuple[float, Dict[str, str], Optional[str]]] = None
 
 
 def fetch_latest_release_info(timeout: float = 5.0) -> Optional[Dict[str, str]]:
     """Return dict with latest release information or None on failure.
 
     Dict keys: version, download_url, checksum_url, notes
+    download_url is None when the release offers no downloadable script.
+    Lookups that found a download are reused for _RELEASE_INFO_TTL seconds,
+    then revalidated with If-None-Match.
     """
+    global _RELEASE_INFO_CACHE
+    extra_headers: Optional[Dict[str, str]] = None
+    if _RELEASE_INFO_CACHE is not None:
+        fetched_at, cached, cached_etag = _RELEASE_INFO_CACHE
+        if time.monotonic() - fetched_at < _RELEASE_INFO_TTL:
+            return dict(cached)
+        if cached_etag:
+            extra_headers = {"If-None-Match": cached_etag}
+
     try:
-        raw = _http_request(GITHUB_API_LATEST, timeout)
-        data = json.loads(raw.decode("utf-8", errors="ignore"))
+        with _http_open(GITHUB_API_LATEST, timeout, extra_headers) as resp:
+            etag = resp.headers.get("ETag")
+            # json.loads takes the UTF-8 bytes as-is; no separate decode copy needed.
+            data = json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304 and _RELEASE_INFO_CACHE is not None:
+            # Unchanged release: no body to parse, and 304s do not count against the rate limit.
+            _, cached, cached_etag = _RELEASE_INFO_CACHE
+            _RELEASE_INFO_CACHE = (time.monotonic(), cached, cached_etag)
+            return dict(cached)
+        return None
     except Exception:
         return None
+    if not isinstance(data, dict):
+        return None
 
     tag = (data.get("tag_name") or data.get("name") or "").strip()
     if not tag:
@@ -245,86 +321,125 @@ def fetch_latest_release_info(timeout: float = 5.0) -> Optional[Dict[str, str]]:
     assets = data.get("assets") or []
     download_url: Optional[str] = None
     checksum_url: Optional[str] = None
-    # Prefer an attached Python asset if present
+    # One pass: prefer an attached Python asset, plus a checksum asset (e.g. *.sha256)
     for asset in assets:
-        try:
-            name = (asset.get("name") or "").lower()
-            if name == "pbs_chunk_checker.py" or name.endswith(".py"):
-                download_url = asset.get("browser_download_url")
-                if download_url:
-                    break
-        except Exception:
+        if not isinstance(asset, dict):
             continue
-    # locate checksum asset (best-effort, e.g. *.sha256)
-    for asset in assets:
-        try:
-            name = (asset.get("name") or "").lower()
-            if "pbs_chunk_checker" in name and name.endswith(".sha256"):
-                candidate = asset.get("browser_download_url")
-                if candidate:
-                    checksum_url = candidate
-                    break
-        except Exception:
+        url = asset.get("browser_download_url")
+        if not url:
             continue
+        name = (asset.get("name") or "").lower()
+        if download_url is None and name.endswith(".py"):
+            download_url = url
+        elif checksum_url is None and "pbs_chunk_checker" in name and name.endswith(".sha256"):
+            checksum_url = url
+        if download_url and checksum_url:
+            break
 
-    # Fallback to raw file from the tag
+    # Fallback to raw file from the tag; a HEAD check keeps a dead URL from
+    # being offered, so callers can skip the update instead of downloading a 404.
     if not download_url:
-        download_url = GITHUB_RAW_TEMPLATE.format(tag=tag)
+        raw_url = GITHUB_RAW_TEMPLATE.format(tag=tag)
+        if _http_head(raw_url, timeout) == 200:
+            download_url = raw_url
     notes = data.get("body") or ""
-    return {
+    info = {
         "version": tag,
         "download_url": download_url,
         "checksum_url": checksum_url,
         "notes": notes,
     }
+    if download_url:
+        _RELEASE_INFO_CACHE = (time.monotonic(), info, etag)
+    else:
+        # A failed HEAD may be transient; don't let the TTL or a 304 keep it alive.
+        _RELEASE_INFO_CACHE = None
+    return dict(info)
+
+
+# First 64-hex run on a line that is not a '#' comment.
+_SHA256_HEX = re.compile(r"^(?![ \t\r\f\v]*#)[^\n]*?\b([a-fA-F0-9]{64})\b", re.MULTILINE)
 
 
 def _extract_sha256_from_text(text: str) -> Optional[str]:
-    """Extract first SHA256 digest from checksum text."""
-    pattern = re.compile(r"\b[a-fA-F0-9]{64}\b")
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        match = pattern.search(line)
-        if match:
-            return match.group(0).lower()
-    return None
+    """Extract first SHA256 digest from checksum text (single regex scan)."""
+    match = _SHA256_HEX.search(text)
+    return match.group(1).lower() if match else None
+
+
+_DOWNLOAD_BLOCK_SIZE = 64 * 1024
+_UPDATE_CANCEL_GRACE = 2.0  # seconds to wait for a canceled update to settle
 
 
+def _discard_file(path: str) -> None:
+    """Remove path if it still exists (best-effort)."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
 
 def perform_self_update(
     download_url: str,
     timeout: float = 30.0,
     checksum_url: Optional[str] = None,
+    cancel: Optional[threading.Event] = None,
 ) -> Tuple[bool, str]:
     """Download latest script and replace the current file atomically.
 
-    Returns (success, message).
+    Returns (success, message). Setting cancel aborts the update between
+    download blocks, around the checksum fetch, or before the file is replaced.
     """
-    script_path = Path(__file__).resolve()
-    tmp_path = script_path.with_suffix(script_path.suffix + ".new")
-    bak_path = script_path.with_suffix(script_path.suffix + ".bak")
+    script_path = os.path.realpath(__file__)
+    bak_path = script_path + ".bak"
+    discard_tmp: Optional[Callable[[], None]] = None
     replaced = False
     try:
-        content = _http_request(download_url, timeout)
-        if not content:
-            return False, "Download returned empty content."
-        # Basic sanity check: ensure file looks like a Python script for this tool
-        header = content[:128].decode("utf-8", errors="ignore")
-        if "PBS_Chunk_Checker" not in header or not header.startswith("#!/"):
-            return False, "Downloaded file does not look like a valid script."
+        # Unique temp name next to the script, so an abandoned download still
+        # running in the background never shares a file with a new attempt.
+        tmp_file = tempfile.NamedTemporaryFile(
+            mode="wb",
+            dir=os.path.dirname(script_path),
+            prefix=f".{os.path.basename(script_path)}.",
+            suffix=".new",
+            delete=False,
+        )
+        tmp_path = tmp_file.name
+        discard_tmp = functools.partial(_discard_file, tmp_path)
+        # A canceled download left running on a daemon thread dies with the
+        # interpreter, so also drop the temp file at exit.
+        atexit.register(discard_tmp)
+        # Stream to the temp file and hash on the fly; only one block is held in memory.
+        hasher = hashlib.sha256()
+        with tmp_file as f, _http_open(download_url, timeout) as resp:
+            # Basic sanity check: ensure file looks like a Python script for this tool
+            header = resp.read(128)
+            if not header:
+                return False, "Download returned empty content."
+            if not header.startswith(b"#!/") or b"PBS_Chunk_Checker" not in header:
+                return False, "Downloaded file does not look like a valid script."
+            block = header
+            while block:
+                if cancel is not None and cancel.is_set():
+                    return False, "Update canceled."
+                hasher.update(block)
+                f.write(block)
+                block = resp.read(_DOWNLOAD_BLOCK_SIZE)
 
         if checksum_url:
+            if cancel is not None and cancel.is_set():
+                return False, "Update canceled."
             try:
                 checksum_data = _http_request(checksum_url, timeout)
                 checksum_text = checksum_data.decode("utf-8", errors="ignore")
             except Exception as exc:
                 return False, f"Failed to verify checksum: {exc}"
+            if cancel is not None and cancel.is_set():
+                return False, "Update canceled."
             expected = _extract_sha256_from_text(checksum_text)
             if not expected:
                 return False, "Checksum file did not contain a SHA256 digest."
-            digest = hashlib.sha256(content).hexdigest()
+            digest = hasher.hexdigest()
             if digest.lower() != expected.lower():
                 return (
                     False,
@@ -334,13 +449,11 @@ def perform_self_update(
 
         # Preserve mode bits
         try:
-            st = script_path.stat()
+            st = os.stat(script_path)
             mode = st.st_mode
         except Exception:
             mode = None  # best-effort
 
-        with open(tmp_path, "wb") as f:
-            f.write(content)
         if mode is not None:
             try:
                 os.chmod(tmp_path, mode)
@@ -353,24 +466,30 @@ def perform_self_update(
         except Exception:
             pass
 
+        if cancel is not None and cancel.is_set():
+            return False, "Update canceled."
         os.replace(tmp_path, script_path)
         replaced = True
-        return True, f"Successfully updated. Backup saved as {bak_path.name}."
+        return True, f"Successfully updated. Backup saved as {os.path.basename(bak_path)}."
     except urllib.error.URLError as e:
         return False, f"Network error: {e}"
     except Exception as e:
         return False, f"Update failed: {e}"
     finally:
-        try:
-            if not replaced and tmp_path.exists():
-                tmp_path.unlink()
-        except Exception:
-            pass
+        if discard_tmp is not None:
+            atexit.unregister(discard_tmp)
+            if not replaced:
+                discard_tmp()
 
 
 def format_elapsed(seconds: float) -> str:
     """Return a compact runtime string like '1h 02m 03s'."""
-    seconds_int = int(seconds)
+    return _format_whole_seconds(int(seconds))
+
+
+@functools.lru_cache(maxsize=64)
+def _format_whole_seconds(seconds_int: int) -> str:
+    """Cached worker for format_elapsed; progress redraws repeat each second."""
     hours, remainder = divmod(seconds_int, 3600)
     minutes, secs = divmod(remainder, 60)
     if hours:
@@ -378,16 +497,17 @@ def format_elapsed(seconds: float) -> str:
     return f"{minutes}m {secs:02}s"
 
 
+_SIZE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
+
+
 def human_readable_size(num_bytes: int) -> str:
     """Format bytes using IEC units with 'B' suffix (e.g., '1.0KiB')."""
-    units = ["B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB"]
     size = float(num_bytes)
-    for unit in units:
-        if size < 1024.0 or unit == units[-1]:
-            if unit == "B":
-                return f"{int(size)}B"
-            return f"{size:.1f}{unit}"
-        size /= 1024.0
+    # each IEC unit spans 10 bits, so the bit length picks the unit directly
+    unit_idx = min(max(int(size).bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    if unit_idx == 0:
+        return f"{int(size)}B"
+    return f"{size / (1 << (unit_idx * 10)):.1f}{_SIZE_UNITS[unit_idx]}"
 
 
 def run_cmd(
@@ -397,11 +517,14 @@ def run_cmd(
     text: bool = True,
     timeout: Optional[float] = None,
 ) -> subprocess.CompletedProcess:
-    """Run a command and return the CompletedProcess. Raises on failure if check=True."""
+    """Run a command and return the CompletedProcess. Raises on failure if check=True.
+
+    All parts of cmd must already be str; the program name is mapped through COMMAND_PATHS.
+    """
     try:
         if not cmd:
             raise ValueError("Command must not be empty.")
-        command = [str(part) for part in cmd]
+        command = list(cmd)
         resolved = COMMAND_PATHS.get(command[0])
         if resolved:
             command[0] = resolved
@@ -433,9 +556,78 @@ def run_cmd(
         raise
 
 
+_JSON_PATH_FIELD = re.compile(r'"path"\s*:\s*"([^"]+)"')
+_DATASTORE_NAME_PREFIX = re.compile(r"^([A-Za-z0-9_.-]+)\b")
+
+
+def is_valid_datastore_name(name: str) -> bool:
+    """Return True if name is non-empty and only uses letters, digits, '.', '_' or '-'."""
+    return bool(name) and DATASTORE_NAME_CHARS.issuperset(name)
+
+
+# PBS section config; each datastore is a "datastore: <name>" header followed by
+# indented "<key> <value>" lines.
+_DATASTORE_CFG = "/etc/proxmox-backup/datastore.cfg"
+_CFG_SECTION_HEADER = re.compile(r"^(\S+):\s*(\S+)\s*$")
+
+
+def _read_datastore_cfg() -> Dict[str, str]:
+    """Return {name: path} for plain datastores listed in datastore.cfg.
+
+    Returns an empty dict when the file is missing or unreadable. Removable
+    datastores (backing-device) and relative paths are left out so they are
+    resolved by proxmox-backup-manager instead.
+    """
+    try:
+        with open(_DATASTORE_CFG, encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return {}
+
+    sections: List[Tuple[str, Dict[str, str]]] = []
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            m = _CFG_SECTION_HEADER.match(line)
+            if m and m.group(1) == "datastore":
+                sections.append((m.group(2), {}))
+            else:
+                sections.append(("", {}))
+            continue
+        if sections:
+            key, _, value = line.strip().partition(" ")
+            sections[-1][1][key] = value.strip()
+
+    paths: Dict[str, str] = {}
+    for name, options in sections:
+        path = options.get("path", "")
+        if name and path.startswith("/") and "backing-device" not in options:
+            paths[name] = path
+    return paths
+
+
 def get_datastore_path(datastore_name: str) -> str:
-    """Resolve the filesystem path of a PBS datastore via proxmox-backup-manager."""
+    """Resolve the filesystem path of a PBS datastore.
+
+    Reads datastore.cfg directly and only asks proxmox-backup-manager when the
+    datastore is not found there. Successful lookups are cached for the
+    lifetime of the process.
+    """
+    cached = _DATASTORE_PATH_CACHE.get(datastore_name)
+    if cached is not None:
+        return cached
+
+    for name, path in _read_datastore_cfg().items():
+        _DATASTORE_PATH_CACHE.setdefault(name, path)
+    cached = _DATASTORE_PATH_CACHE.get(datastore_name)
+    if cached is not None:
+        return cached
+
     last_error = ""
+    # The plain-output call is only worth a second subprocess when the JSON
+    # call itself was rejected; a successful JSON call is searched directly.
+    retry_plain = False
     try:
         cp = run_cmd(
             [
@@ -454,10 +646,15 @@ def get_datastore_path(datastore_name: str) -> str:
                 data = json.loads(cp.stdout)
             except json.JSONDecodeError:
                 data = {}
-            path = data.get("path")
+            path = data.get("path") if isinstance(data, dict) else None
+            if not path:
+                m = _JSON_PATH_FIELD.search(cp.stdout)
+                path = m.group(1) if m else None
             if path:
+                _DATASTORE_PATH_CACHE[datastore_name] = path
                 return path
         if cp.returncode != 0:
+            retry_plain = True
             err_msg = ""
             if cp.stderr:
                 err_msg = cp.stderr.strip()
@@ -473,35 +670,37 @@ def get_datastore_path(datastore_name: str) -> str:
     except FileNotFoundError:
         raise
 
-    try:
-        cp = run_cmd(
-            [
-                "proxmox-backup-manager",
-                "datastore",
-                "show",
-                datastore_name,
-            ],
-            check=False,
-            timeout=COMMAND_TIMEOUTS["manager_show"],
-        )
-        m = re.search(r'"path"\s*:\s*"([^"]+)"', cp.stdout or "")
-        if m:
-            return m.group(1)
-        if cp.returncode != 0:
-            err_msg = ""
-            if cp.stderr:
-                err_msg = cp.stderr.strip()
-            elif cp.stdout:
-                err_msg = cp.stdout.strip()
-            if err_msg:
-                last_error = err_msg
-    except subprocess.TimeoutExpired as exc:
-        last_error = (
-            f"{_format_command(exc.cmd)} timed out after "
-            f"{COMMAND_TIMEOUTS['manager_show']}s"
-        )
-    except FileNotFoundError:
-        raise
+    if retry_plain:
+        try:
+            cp = run_cmd(
+                [
+                    "proxmox-backup-manager",
+                    "datastore",
+                    "show",
+                    datastore_name,
+                ],
+                check=False,
+                timeout=COMMAND_TIMEOUTS["manager_show"],
+            )
+            m = _JSON_PATH_FIELD.search(cp.stdout or "")
+            if m:
+                _DATASTORE_PATH_CACHE[datastore_name] = m.group(1)
+                return m.group(1)
+            if cp.returncode != 0:
+                err_msg = ""
+                if cp.stderr:
+                    err_msg = cp.stderr.strip()
+                elif cp.stdout:
+                    err_msg = cp.stdout.strip()
+                if err_msg:
+                    last_error = err_msg
+        except subprocess.TimeoutExpired as exc:
+            last_error = (
+                f"{_format_command(exc.cmd)} timed out after "
+                f"{COMMAND_TIMEOUTS['manager_show']}s"
+            )
+        except FileNotFoundError:
+            raise
 
     if not last_error:
         last_error = f"Datastore '{datastore_name}' not found or path not resolvable."
@@ -515,6 +714,7 @@ def list_datastores() -> List[str]:
 
     Tries JSON first, falls back to parsing text output. If the command is not
     available or fails, returns an empty list so the caller can ask for manual input.
+    Paths from the JSON listing are stored in the get_datastore_path cache.
     """
     try:
         cp = run_cmd(
@@ -540,6 +740,11 @@ def list_datastores() -> List[str]:
                             )
                             if isinstance(n, str):
                                 names.append(n)
+                                # the listing already carries the path, so picking
+                                # a datastore needs no extra 'datastore show' call
+                                path = item.get("path")
+                                if isinstance(path, str) and path:
+                                    _DATASTORE_PATH_CACHE[n] = path
                     return sorted(set(names))
             except json.JSONDecodeError:
                 pass
@@ -561,7 +766,7 @@ def list_datastores() -> List[str]:
     names2: List[str] = []
     for line in (cp.stdout or "").splitlines():
         line = line.strip()
-        m = re.match(r"^([A-Za-z0-9_.-]+)\b", line)
+        m = _DATASTORE_NAME_PREFIX.match(line)
         if m:
             names2.append(m.group(1))
     return sorted(set(names2))
@@ -610,17 +815,33 @@ def ensure_required_tools() -> None:
         COMMAND_ENV["PATH"] = os.pathsep.join(path_entries)
 
 
+_INDEX_SUFFIXES = (".fidx", ".didx")
+
+
 def find_index_files(search_path: str) -> list[str]:
-    """Recursively find *.fidx and *.didx under search_path."""
+    """Recursively find *.fidx and *.didx under search_path.
+
+    The .chunks store never holds index files and is not descended into.
+    """
     matches: list[str] = []
     sp = Path(search_path)
     if not sp.is_dir():
         sys.stderr.write(f"{ICONS['error']} Error: folder does not exist → {search_path}\n")
         sys.exit(1)
-    for root, dirs, files in os.walk(sp):
-        for name in files:
-            if name.endswith(".fidx") or name.endswith(".didx"):
-                matches.append(str(Path(root) / name))
+    pending = [str(sp)]
+    while pending:
+        try:
+            it = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir():
+                    if name != ".chunks" and not entry.is_symlink():
+                        pending.append(entry.path)
+                elif name.endswith(_INDEX_SUFFIXES):
+                    matches.append(entry.path)
     return matches
 
 
@@ -642,15 +863,12 @@ def group_index_files_by_snapshot(index_files: list[str]) -> dict[str, list[str]
 
 def resolve_search_path(datastore_path: str, searchpath: str) -> Path:
     """Return an absolute path inside datastore_path for the provided searchpath."""
-    base = Path(datastore_path).resolve()
+    base = os.path.realpath(datastore_path)
     relative = (searchpath or "").lstrip("/")
-    candidate = base if not relative else (base / relative)
-    candidate = candidate.resolve()
-    try:
-        candidate.relative_to(base)
-    except ValueError as exc:
-        raise ValueError("Search path escapes datastore root.") from exc
-    return candidate
+    candidate = os.path.realpath(os.path.join(base, relative)) if relative else base
+    if os.path.commonpath([base, candidate]) != base:
+        raise ValueError("Search path escapes datastore root.")
+    return Path(candidate)
 
 # =============================================================================
 # Interactive helpers (menu-driven mode)
@@ -659,9 +877,24 @@ def resolve_search_path(datastore_path: str, searchpath: str) -> Path:
 _CURSES_SENTINEL_MANUAL = "__CURSES_MANUAL__"
 _UI_OPTIONS_HANDLER: Optional[Callable[[Optional[object]], None]] = None
 _UI_VERSION_HANDLER: Optional[Callable[[Optional[object]], None]] = None
-
+_KEY_DRAIN_LIMIT = 32
+# action key codes shared by the curses menus (built once, not per key press)
+_KEY_SPACE = ord(' ')
+_KEYS_SELECT = (10, 13, _KEY_SPACE)
+_KEYS_MANUAL = (ord('m'), ord('M'))
+_KEYS_OPTIONS = (ord('o'), ord('O'))
+_KEYS_VERSION = (ord('v'), ord('V'))
+_KEYS_QUIT = (ord('q'), ord('Q'), 27)
+_POPUP_MIN_WIDTH = 20
+_POPUP_MIN_HEIGHT = 4
+
+
+@functools.lru_cache(maxsize=None)
 def _want_curses_ui() -> bool:
-    """Return True if a curses UI is likely usable on this terminal."""
+    """Return True if a curses UI is likely usable on this terminal.
+
+    Evaluated once per process; the environment and the terminal do not change mid-run.
+    """
     if os.environ.get("PBS_CC_NO_CURSES") == "1":
         return False
     if curses is None:
@@ -682,11 +915,21 @@ def _set_ui_handlers(
     _UI_VERSION_HANDLER = version_handler
 
 
+def _curses_flush_input(stdscr: Optional[object]) -> None:
+    """Drop keys typed while a blocking overlay was open so they are not replayed."""
+    if stdscr is not None and curses is not None:
+        try:
+            curses.flushinp()
+        except Exception:
+            pass
+
+
 def _invoke_options_handler(stdscr: Optional[object] = None) -> None:
     """Invoke the registered options handler if present; gently flash otherwise."""
     handler = _UI_OPTIONS_HANDLER
     if handler is not None:
         handler(stdscr)
+        _curses_flush_input(stdscr)
     elif stdscr is not None and curses is not None:
         try:
             curses.flash()
@@ -699,6 +942,7 @@ def _invoke_version_handler(stdscr: Optional[object] = None) -> None:
     handler = _UI_VERSION_HANDLER
     if handler is not None:
         handler(stdscr)
+        _curses_flush_input(stdscr)
     elif stdscr is not None and curses is not None:
         try:
             curses.flash()
@@ -706,92 +950,221 @@ def _invoke_version_handler(stdscr: Optional[object] = None) -> None:
             pass
 
 
+def _curses_nav_keys() -> Tuple[int, ...]:
+    """Return the key codes that only move the selection (safe to coalesce)."""
+    return (
+        curses.KEY_UP,
+        curses.KEY_DOWN,
+        ord('k'),
+        ord('j'),
+        curses.KEY_NPAGE,
+        curses.KEY_PPAGE,
+        curses.KEY_HOME,
+        curses.KEY_END,
+    )
+
+
+def _curses_read_keys(stdscr: object, nav_keys: Sequence[int]) -> List[int]:
+    """Block for one key, then drain already queued navigation keys.
+
+    Held or repeated arrow keys are collapsed into a single batch so the
+    caller redraws once per batch instead of once per key. Draining stops at
+    the first non-navigation key (which is returned as the last element) or
+    after _KEY_DRAIN_LIMIT keys to keep latency bounded.
+    """
+    keys = [stdscr.getch()]  # type: ignore[attr-defined]
+    if keys[0] not in nav_keys:
+        return keys
+    stdscr.nodelay(True)  # type: ignore[attr-defined]
+    try:
+        while len(keys) < _KEY_DRAIN_LIMIT:
+            ch = stdscr.getch()  # type: ignore[attr-defined]
+            if ch == -1:
+                break
+            keys.append(ch)
+            if ch not in nav_keys:
+                break
+    finally:
+        stdscr.nodelay(False)  # type: ignore[attr-defined]
+    return keys
+
+
+def _curses_repaint_rows(stdscr: object, width: int, rows: Iterable[Tuple[int, str, int]]) -> None:
+    """Rewrite single menu rows in place and refresh; used when only the highlight moved."""
+    for y, text, attr in rows:
+        try:
+            stdscr.addstr(y, 0, text[:width], attr)  # type: ignore[attr-defined]
+        except Exception:
+            pass
+    stdscr.refresh()  # type: ignore[attr-defined]
+
+
 def _curses_select_menu(prompt: str, options: List[str], allow_manual: bool) -> Optional[str]:
-    """Curses-based selection list. Returns the chosen label or a special
-    sentinel when manual input was requested. None if canceled.
+    """Curses-based selection list. Returns the chosen label or the manually
+    entered value (read in a popup within the same curses session). Returns
+    _CURSES_SENTINEL_MANUAL if manual entry was left empty, None if canceled.
     """
     def _draw(stdscr):
+        # curses.wrapper already enabled keypad mode on stdscr
         curses.curs_set(0)
-        stdscr.keypad(True)
+        nav_keys = _curses_nav_keys()
+        # bind hot curses attributes once instead of per key press
+        addstr = stdscr.addstr
+        a_reverse = curses.A_REVERSE
+        up_keys = (curses.KEY_UP, ord('k'))
+        down_keys = (curses.KEY_DOWN, ord('j'))
+        key_npage, key_ppage = curses.KEY_NPAGE, curses.KEY_PPAGE
+        key_home, key_end = curses.KEY_HOME, curses.KEY_END
+        key_resize = curses.KEY_RESIZE
+        prompt_lines = prompt.splitlines()
+        help_line = (
+            "↑/↓ move  Space/Enter select  m manual  o options  v version  q quit"
+            if allow_manual
+            else "↑/↓ move  Space/Enter select  o options  v version  q quit"
+        )
+        # option rows pre-truncated for the current width (plain, highlighted)
+        rows_w = -1
+        plain_rows: List[str] = []
+        selected_rows: List[str] = []
         idx = 0
         top = 0
+        # redraw only after a key that can change the screen
+        dirty = True
+        last_idx = idx
         while True:
-            stdscr.erase()
-            h, w = stdscr.getmaxyx()
-            y = 0
-            for line in prompt.splitlines():
-                try:
-                    stdscr.addstr(y, 0, line[: max(1, w - 1)])
-                except Exception:
-                    pass
-                y += 1
-            view_h = max(1, h - (y + 1))
-            if idx < top:
-                top = idx
-            if idx >= top + view_h:
-                top = max(0, idx - view_h + 1)
-            end = min(len(options), top + view_h)
-            for i in range(top, end):
-                label = options[i]
-                prefix = "> " if i == idx else "  "
-                text = (prefix + label)[: max(1, w - 1)]
+            if dirty:
+                stdscr.erase()
+                h, w = stdscr.getmaxyx()
+                max_x = max(1, w - 1)  # usable row width
+                y = 0
+                for line in prompt_lines:
+                    try:
+                        addstr(y, 0, line[:max_x])
+                    except Exception:
+                        pass
+                    y += 1
+                view_h = max(1, h - (y + 1))
+                if idx < top:
+                    top = idx
+                if idx >= top + view_h:
+                    top = max(0, idx - view_h + 1)
+                if w != rows_w:
+                    plain_rows = [("  " + label)[:max_x] for label in options]
+                    selected_rows = [("> " + label)[:max_x] for label in options]
+                    rows_w = w
+                end = min(len(options), top + view_h)
+                for i in range(top, end):
+                    try:
+                        if i == idx:
+                            addstr(y + (i - top), 0, selected_rows[i], a_reverse)
+                        else:
+                            addstr(y + (i - top), 0, plain_rows[i])
+                    except Exception:
+                        pass
                 try:
-                    stdscr.addstr(y + (i - top), 0, text, curses.A_REVERSE if i == idx else 0)
+                    addstr(h - 1, 0, help_line[:max_x])
                 except Exception:
                     pass
-            help_line = (
-                "↑/↓ move  Space/Enter select  m manual  o options  v version  q quit"
-                if allow_manual
-                else "↑/↓ move  Space/Enter select  o options  v version  q quit"
-            )
-            try:
-                stdscr.addstr(h - 1, 0, help_line[: max(1, w - 1)])
-            except Exception:
-                pass
-            stdscr.refresh()
-            ch = stdscr.getch()
-            if ch in (curses.KEY_UP, ord('k')):
-                if idx > 0:
-                    idx -= 1
-            elif ch in (curses.KEY_DOWN, ord('j')):
-                if idx < len(options) - 1:
-                    idx += 1
-            elif ch in (curses.KEY_NPAGE,):
-                step = max(1, view_h - 1)
-                idx = min(len(options) - 1, idx + step)
-            elif ch in (curses.KEY_PPAGE,):
-                step = max(1, view_h - 1)
-                idx = max(0, idx - step)
-            elif ch in (curses.KEY_HOME,):
-                idx = 0
-            elif ch in (curses.KEY_END,):
-                idx = len(options) - 1
-            elif ch in (10, 13, ord(' ')):
-                return options[idx]
-            elif allow_manual and ch in (ord('m'), ord('M')):
-                return _CURSES_SENTINEL_MANUAL
-            elif ch in (ord('o'), ord('O')):
-                _invoke_options_handler(stdscr)
-            elif ch in (ord('v'), ord('V')):
-                _invoke_version_handler(stdscr)
-            elif ch in (ord('q'), ord('Q'), 27):
-                return None
+                stdscr.refresh()
+                dirty = False
+                last_idx = idx
+            for ch in _curses_read_keys(stdscr, nav_keys):
+                if ch in up_keys:
+                    if idx > 0:
+                        idx -= 1
+                elif ch in down_keys:
+                    if idx < len(options) - 1:
+                        idx += 1
+                elif ch == key_npage:
+                    step = max(1, view_h - 1)
+                    idx = min(len(options) - 1, idx + step)
+                elif ch == key_ppage:
+                    step = max(1, view_h - 1)
+                    idx = max(0, idx - step)
+                elif ch == key_home:
+                    idx = 0
+                elif ch == key_end:
+                    idx = len(options) - 1
+                elif ch in _KEYS_SELECT:
+                    return options[idx]
+                elif allow_manual and ch in _KEYS_MANUAL:
+                    manual = _curses_popup(
+                        stdscr, "Manual entry", ["Type the value to use."], prompt="Value: "
+                    )
+                    return manual or _CURSES_SENTINEL_MANUAL
+                elif ch in _KEYS_OPTIONS:
+                    _invoke_options_handler(stdscr)
+                elif ch in _KEYS_VERSION:
+                    _invoke_version_handler(stdscr)
+                elif ch in _KEYS_QUIT:
+                    return None
+                elif ch != key_resize:
+                    continue
+                # moving the selection alone only repaints two rows
+                if ch not in nav_keys:
+                    dirty = True
+            if not dirty and idx != last_idx:
+                if top <= idx < top + view_h:
+                    _curses_repaint_rows(stdscr, max_x, (
+                        (y + last_idx - top, plain_rows[last_idx], 0),
+                        (y + idx - top, selected_rows[idx], a_reverse),
+                    ))
+                    last_idx = idx
+                else:
+                    dirty = True
     try:
         return curses.wrapper(_draw)  # type: ignore[attr-defined]
     except Exception:
         return None
 
 
+_WAIT_POLL_MS = 100  # key polling interval while a popup waits for background work
+
+
+def _curses_wait_for(win: object, pending: futures.Future) -> None:
+    """Return once pending is done, or earlier if q/Esc is pressed in win."""
+    win.timeout(_WAIT_POLL_MS)  # type: ignore[attr-defined]
+    try:
+        while not pending.done():
+            if win.getch() in _KEYS_QUIT:  # type: ignore[attr-defined]
+                break
+    finally:
+        win.timeout(-1)  # type: ignore[attr-defined]
+
+
+def _run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> futures.Future:
+    """Start func on a daemon thread and return a future for its result.
+
+    An abandoned call finishes on its own and never delays interpreter exit
+    (executor threads would be joined at exit, e.g. behind a stalled download).
+    """
+    future: futures.Future = futures.Future()
+
+    def _worker() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=_worker, daemon=True).start()
+    return future
+
+
 def _curses_popup(
     stdscr: object,
     title: str,
     body_lines: List[str],
     prompt: Optional[str] = None,
+    wait_for: Optional[futures.Future] = None,
 ) -> Optional[str]:
     """Render a centered popup window with optional input prompt.
 
     Returns entered text if a prompt is shown. Returns None for simple
-    acknowledge popups or when canceled/unavailable.
+    acknowledge popups or when canceled/unavailable. With wait_for, the
+    popup stays up until that future is done or the user presses q/Esc
+    instead of waiting for a key; check wait_for.done() afterwards.
     """
     if curses is None:
         return None
@@ -800,16 +1173,50 @@ def _curses_popup(
     except Exception:
         return None
 
+    if w < _POPUP_MIN_WIDTH or h < _POPUP_MIN_HEIGHT:
+        # Too small for a framed popup: use the bottom line(s) only.
+        line_w = max(1, w - 1)
+        if prompt is not None:
+            # Question on the line above (if any), answer read after the prompt.
+            question = next((line for line in reversed(body_lines) if line.strip()), title)
+            label = prompt[: line_w // 2]
+            text = ""
+            try:
+                if h > 1:
+                    stdscr.move(h - 2, 0)  # type: ignore[attr-defined]
+                    stdscr.clrtoeol()  # type: ignore[attr-defined]
+                    stdscr.addstr(h - 2, 0, question[:line_w])  # type: ignore[attr-defined]
+                stdscr.move(h - 1, 0)  # type: ignore[attr-defined]
+                stdscr.clrtoeol()  # type: ignore[attr-defined]
+                stdscr.addstr(h - 1, 0, label)  # type: ignore[attr-defined]
+                stdscr.refresh()  # type: ignore[attr-defined]
+                curses.echo()
+                try:
+                    raw = stdscr.getstr(h - 1, len(label), max(1, line_w - len(label)))  # type: ignore[attr-defined]
+                    text = raw.decode(errors="ignore").strip()
+                finally:
+                    curses.noecho()
+            except Exception:
+                pass
+            return text
+        message = (body_lines[0] if body_lines else title) or title
+        try:
+            stdscr.addstr(h - 1, 0, message[:line_w])  # type: ignore[attr-defined]
+            stdscr.refresh()  # type: ignore[attr-defined]
+            if wait_for is not None:
+                _curses_wait_for(stdscr, wait_for)
+            else:
+                stdscr.getch()  # type: ignore[attr-defined]
+        except Exception:
+            pass
+        return None
+
     lines = body_lines[:]
     title_width = len(title) + 2 if title else 0
     line_widths = [len(line) for line in lines]
     prompt_width = len(prompt) if prompt else 0
     content_width = max([title_width] + line_widths + [prompt_width])
-    width = (
-        max(32, min(w - 2, content_width + 4))
-        if w > 10
-        else max(10, w - 1)
-    )
+    width = min(w, max(32, min(w - 2, content_width + 4)))
     body_space = max(1, (h - (4 if prompt else 3)))
     visible_lines = lines[:body_space]
     height = len(visible_lines) + (4 if prompt else 3)
@@ -822,39 +1229,45 @@ def _curses_popup(
         win = curses.newwin(height, width, start_y, start_x)
     except Exception:
         return None
+    inner_w = width - 2
     win.box()
     if title:
-        title_text = f" {title} "
+        title_text = f" {title} "[:inner_w]
         try:
             win.addstr(0, max(1, (width - len(title_text)) // 2), title_text, curses.A_BOLD)
-        except Exception:
+        except curses.error:
             pass
     y = 1
     for line in visible_lines:
-        truncated = line[: width - 2]
         try:
-            win.addstr(y, 1, truncated.ljust(width - 2))
-        except Exception:
+            win.addstr(y, 1, line[:inner_w].ljust(inner_w))
+        except curses.error:
             pass
         y += 1
     if prompt is None:
-        footer = "Press any key to continue..."
+        footer = "Press q to cancel..." if wait_for is not None else "Press any key to continue..."
         try:
-            win.addstr(height - 2, 1, footer[: width - 2].ljust(width - 2), curses.A_DIM)
-        except Exception:
+            win.addstr(height - 2, 1, footer[:inner_w].ljust(inner_w), curses.A_DIM)
+        except curses.error:
             pass
         win.refresh()
-        win.getch()
+        if wait_for is not None:
+            _curses_wait_for(win, wait_for)
+        else:
+            win.getch()
+        _curses_flush_input(stdscr)
         del win
+        # Only queue the restored screen; the caller's next redraw or popup
+        # flushes it together with its own output in one doupdate.
         stdscr.touchwin()  # type: ignore[attr-defined]
-        stdscr.refresh()  # type: ignore[attr-defined]
+        stdscr.noutrefresh()  # type: ignore[attr-defined]
         return None
 
-    prompt_line = prompt[: width - 2]
+    prompt_line = prompt[:inner_w]
     input_y = height - 2
     try:
-        win.addstr(input_y, 1, prompt_line.ljust(width - 2))
-    except Exception:
+        win.addstr(input_y, 1, prompt_line.ljust(inner_w))
+    except curses.error:
         pass
     win.refresh()
     curses.echo()
@@ -870,16 +1283,21 @@ def _curses_popup(
     text = raw.decode(errors="ignore").strip()
     del win
     stdscr.touchwin()  # type: ignore[attr-defined]
-    stdscr.refresh()  # type: ignore[attr-defined]
+    stdscr.noutrefresh()  # type: ignore[attr-defined]
     return text
 
 
 def _curses_show_version(stdscr: object) -> None:
     """Show version and offer update if a newer release is available."""
-    # Inform about current version first
+    # Inform about current version first; the lookup runs while the popup is up
     lines = [f"PBS_Chunk_Checker version {__version__}"]
 
-    info = fetch_latest_release_info(timeout=5.0)
+    pending = _run_in_background(fetch_latest_release_info, timeout=5.0)
+    _curses_popup(stdscr, "Version", lines + ["", "Checking for updates..."], wait_for=pending)
+    if not pending.done():
+        # Canceled by the user; a late result still lands in the release cache.
+        return
+    info = pending.result()
     if info is None:
         lines.append("")
         lines.append("Update check failed.")
@@ -887,7 +1305,13 @@ def _curses_show_version(stdscr: object) -> None:
         return
 
     remote_ver = info.get("version", "")
-    if _is_remote_newer(remote_ver, __version__):
+    newer = _is_remote_newer(remote_ver, __version__)
+    if newer and not info.get("download_url"):
+        lines.append("")
+        lines.append(f"New version available: {remote_ver}")
+        lines.append("No downloadable script was found for this release.")
+        _curses_popup(stdscr, "Version", lines)
+    elif newer:
         lines.append("")
         lines.append(f"New version available: {remote_ver}")
         lines.append("")
@@ -898,11 +1322,26 @@ def _curses_show_version(stdscr: object) -> None:
             prompt="> "
         )
         if choice and choice.strip().lower().startswith("y"):
-            ok, msg = perform_self_update(
+            cancel = threading.Event()
+            pending = _run_in_background(
+                perform_self_update,
                 info["download_url"],
                 timeout=30.0,
                 checksum_url=info.get("checksum_url"),
+                cancel=cancel,
             )
+            _curses_popup(stdscr, "Update", ["Downloading update..."], wait_for=pending)
+            if not pending.done():
+                # Give the worker a moment to reach its next cancel check and
+                # report what actually happened; the file may already be replaced.
+                cancel.set()
+                futures.wait([pending], timeout=_UPDATE_CANCEL_GRACE)
+                if not pending.done():
+                    # Stalled in a read: it stops at the next cancel check, before
+                    # touching the script, and removes its own temp file.
+                    _curses_popup(stdscr, "Update", ["Update canceled."])
+                    return
+            ok, msg = pending.result()
             if ok:
                 _curses_popup(
                     stdscr,
@@ -970,7 +1409,11 @@ def _text_show_version(pause_after: bool = True, clear_screen: bool = True) -> N
             input("Press Enter to continue...")
         return
     remote_ver = info.get("version", "")
-    if _is_remote_newer(remote_ver, __version__):
+    newer = _is_remote_newer(remote_ver, __version__)
+    if newer and not info.get("download_url"):
+        print(f"New version available: {remote_ver}")
+        print("No downloadable script was found for this release.")
+    elif newer:
         print(f"New version available: {remote_ver}")
         ans = input("Update now? [y/N]: ").strip().lower()
         if ans.startswith("y"):
@@ -1125,12 +1568,26 @@ def _text_csv_dir_dialog(args) -> bool:
 
 
 def _options_menu_curses(stdscr: object, args) -> None:
-    """Options overlay (curses): change threads and toggle emoji output."""
-    curses.curs_set(0)
-    stdscr.keypad(True)
+    """Options overlay (curses): change threads and toggle emoji output.
+
+    Runs on the calling menu's stdscr, which already has keypad mode on and the cursor hidden.
+    """
+    nav_keys = _curses_nav_keys()
+    # bind hot curses attributes once instead of per key press
+    addstr = stdscr.addstr
+    a_reverse = curses.A_REVERSE
+    a_bold = curses.A_BOLD
+    up_keys = (curses.KEY_UP, ord('k'))
+    down_keys = (curses.KEY_DOWN, ord('j'))
+    key_npage, key_ppage = curses.KEY_NPAGE, curses.KEY_PPAGE
+    key_home, key_end = curses.KEY_HOME, curses.KEY_END
+    key_resize = curses.KEY_RESIZE
     idx = 0
     top = 0
     notice = ""
+    # redraw only after a key that can change the screen
+    dirty = True
+    last_idx = idx
 
     def _entries() -> List[Tuple[str, str]]:
         return [
@@ -1145,95 +1602,116 @@ def _options_menu_curses(stdscr: object, args) -> None:
             ("back", "Back"),
         ]
 
+    # labels only change after an Enter/Space action, so rebuild them there
+    entries = _entries()
     while True:
-        entries = _entries()
-        stdscr.erase()
-        h, w = stdscr.getmaxyx()
-        header = "PBS_Chunk_Checker - Options"
-        try:
-            stdscr.addstr(0, 0, header[: max(1, w - 1)], curses.A_BOLD)
-        except Exception:
-            pass
-        y = 1
-        if notice:
+        if dirty:
+            stdscr.erase()
+            h, w = stdscr.getmaxyx()
+            max_x = max(1, w - 1)  # usable row width
+            header = "PBS_Chunk_Checker - Options"
             try:
-                stdscr.addstr(y, 0, notice[: max(1, w - 1)])
+                addstr(0, 0, header[:max_x], a_bold)
             except Exception:
                 pass
-            y += 1
-        view_h = max(1, h - (y + 1))
-        if idx < top:
-            top = idx
-        if idx >= top + view_h:
-            top = max(0, idx - view_h + 1)
-        end = min(len(entries), top + view_h)
-        for i in range(top, end):
-            label = entries[i][1]
-            prefix = "> " if i == idx else "  "
-            text = (prefix + label)[: max(1, w - 1)]
+            y = 1
+            if notice:
+                try:
+                    addstr(y, 0, notice[:max_x])
+                except Exception:
+                    pass
+                y += 1
+            view_h = max(1, h - (y + 1))
+            if idx < top:
+                top = idx
+            if idx >= top + view_h:
+                top = max(0, idx - view_h + 1)
+            end = min(len(entries), top + view_h)
+            for i in range(top, end):
+                label = entries[i][1]
+                prefix = "> " if i == idx else "  "
+                text = (prefix + label)[:max_x]
+                try:
+                    addstr(y + (i - top), 0, text, a_reverse if i == idx else 0)
+                except Exception:
+                    pass
+            help_line = "↑/↓ move  Space toggle  Enter open  q back"
             try:
-                stdscr.addstr(y + (i - top), 0, text, curses.A_REVERSE if i == idx else 0)
+                addstr(h - 1, 0, help_line[:max_x])
             except Exception:
                 pass
-        help_line = "↑/↓ move  Space toggle  Enter open  q back"
-        try:
-            stdscr.addstr(h - 1, 0, help_line[: max(1, w - 1)])
-        except Exception:
-            pass
-        stdscr.refresh()
-        ch = stdscr.getch()
-        if ch in (curses.KEY_UP, ord('k')):
-            if idx > 0:
-                idx -= 1
-        elif ch in (curses.KEY_DOWN, ord('j')):
-            if idx < len(entries) - 1:
-                idx += 1
-        elif ch in (curses.KEY_NPAGE,):
-            step = max(1, view_h - 1)
-            idx = min(len(entries) - 1, idx + step)
-        elif ch in (curses.KEY_PPAGE,):
-            step = max(1, view_h - 1)
-            idx = max(0, idx - step)
-        elif ch in (curses.KEY_HOME,):
-            idx = 0
-        elif ch in (curses.KEY_END,):
-            idx = len(entries) - 1
-        elif ch in (10, 13):
-            action = entries[idx][0]
-            if action == "threads":
-                _curses_threads_dialog(stdscr, args)
-                notice = ""
-            elif action == "emoji":
-                _toggle_emoji_setting(args, stdscr)
-                notice = f"Emoji output {'enabled' if _EMOJI_ENABLED else 'disabled'}."
-            elif action == "comments":
-                _toggle_comments_setting(args)
-                notice = (
-                    "Guest comments enabled."
-                    if getattr(args, "show_comments", False)
-                    else "Guest comments disabled."
-                )
-            elif action == "csv_dir":
-                if _curses_csv_dir_dialog(stdscr, args):
-                    notice = f"CSV output directory set to {args.csv_dir}."
-                else:
+            stdscr.refresh()
+            dirty = False
+            last_idx = idx
+        for ch in _curses_read_keys(stdscr, nav_keys):
+            if ch in up_keys:
+                if idx > 0:
+                    idx -= 1
+            elif ch in down_keys:
+                if idx < len(entries) - 1:
+                    idx += 1
+            elif ch == key_npage:
+                step = max(1, view_h - 1)
+                idx = min(len(entries) - 1, idx + step)
+            elif ch == key_ppage:
+                step = max(1, view_h - 1)
+                idx = max(0, idx - step)
+            elif ch == key_home:
+                idx = 0
+            elif ch == key_end:
+                idx = len(entries) - 1
+            elif ch in (10, 13):
+                action = entries[idx][0]
+                if action == "threads":
+                    _curses_threads_dialog(stdscr, args)
                     notice = ""
-            elif action == "back":
+                elif action == "emoji":
+                    _toggle_emoji_setting(args, stdscr)
+                    notice = f"Emoji output {'enabled' if _EMOJI_ENABLED else 'disabled'}."
+                elif action == "comments":
+                    _toggle_comments_setting(args)
+                    notice = (
+                        "Guest comments enabled."
+                        if getattr(args, "show_comments", False)
+                        else "Guest comments disabled."
+                    )
+                elif action == "csv_dir":
+                    if _curses_csv_dir_dialog(stdscr, args):
+                        notice = f"CSV output directory set to {args.csv_dir}."
+                    else:
+                        notice = ""
+                elif action == "back":
+                    return
+                entries = _entries()
+            elif ch == _KEY_SPACE:
+                action = entries[idx][0]
+                if action == "emoji":
+                    _toggle_emoji_setting(args, stdscr)
+                    notice = f"Emoji output {'enabled' if _EMOJI_ENABLED else 'disabled'}."
+                elif action == "comments":
+                    _toggle_comments_setting(args)
+                    notice = (
+                        "Guest comments enabled."
+                        if getattr(args, "show_comments", False)
+                        else "Guest comments disabled."
+                    )
+                entries = _entries()
+            elif ch in _KEYS_QUIT:
                 return
-        elif ch == ord(' '):
-            action = entries[idx][0]
-            if action == "emoji":
-                _toggle_emoji_setting(args, stdscr)
-                notice = f"Emoji output {'enabled' if _EMOJI_ENABLED else 'disabled'}."
-            elif action == "comments":
-                _toggle_comments_setting(args)
-                notice = (
-                    "Guest comments enabled."
-                    if getattr(args, "show_comments", False)
-                    else "Guest comments disabled."
-                )
-        elif ch in (ord('q'), ord('Q'), 27):
-            return
+            elif ch != key_resize:
+                continue
+            # moving the selection alone only repaints two rows
+            if ch not in nav_keys:
+                dirty = True
+        if not dirty and idx != last_idx:
+            if top <= idx < top + view_h:
+                _curses_repaint_rows(stdscr, max_x, (
+                    (y + last_idx - top, "  " + entries[last_idx][1], 0),
+                    (y + idx - top, "> " + entries[idx][1], a_reverse),
+                ))
+                last_idx = idx
+            else:
+                dirty = True
 
 
 def _options_menu_text(args) -> None:
@@ -1303,14 +1781,15 @@ def _prompt_select(
     if _want_curses_ui():
         while True:
             result = _curses_select_menu(prompt, options, allow_manual)
-            if result == _CURSES_SENTINEL_MANUAL and allow_manual:
-                clear_console()
-                manual = input("Enter value: ").strip()
-                return manual or None
+            if result == _CURSES_SENTINEL_MANUAL:
+                return None
             if result is not None:
                 return result
 
     # Fallback: simple numeric menu
+    # Handlers are registered before a menu opens and stay fixed while it runs.
+    options_handler = _UI_OPTIONS_HANDLER
+    version_handler = _UI_VERSION_HANDLER
     feedback = ""
     while True:
         clear_console()
@@ -1323,20 +1802,20 @@ def _prompt_select(
         extra = []
         if allow_manual:
             extra.append("m = enter manually")
-        if _UI_OPTIONS_HANDLER is not None:
+        if options_handler is not None:
             extra.append("o = options")
-        if _UI_VERSION_HANDLER is not None:
+        if version_handler is not None:
             extra.append("v = version")
         extra.append("q = quit")
         print("  (" + ", ".join(extra) + ")")
         choice = input("> ").strip()
         if choice.lower() == "q":
             return None
-        if choice.lower() == "o" and _UI_OPTIONS_HANDLER is not None:
-            _invoke_options_handler(None)
+        if choice.lower() == "o" and options_handler is not None:
+            options_handler(None)
             continue
-        if choice.lower() == "v" and _UI_VERSION_HANDLER is not None:
-            _invoke_version_handler(None)
+        if choice.lower() == "v" and version_handler is not None:
+            version_handler(None)
             continue
         if allow_manual and choice.lower() == "m":
             clear_console()
@@ -1352,6 +1831,47 @@ def _prompt_select(
         feedback = "Invalid input, please try again."
 
 
+def _list_subdirectories(path: Path) -> List[str]:
+    """Return visible subdirectory names of path, sorted case-insensitively.
+
+    Hidden entries and the .chunks store are skipped. Uses os.scandir so the
+    entry type comes from the directory listing; only symlinks cost a stat,
+    and are listed when they point to a directory.
+    """
+    try:
+        with os.scandir(path) as it:
+            names = [
+                entry.name
+                for entry in it
+                if entry.is_dir()
+                and not entry.name.startswith('.')
+                and entry.name != ".chunks"
+            ]
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return []
+    names.sort(key=str.lower)
+    return names
+
+
+# path -> (st_mtime_ns, names); adding or removing an entry bumps the directory mtime
+_SUBDIR_CACHE: Dict[Path, Tuple[int, List[str]]] = {}
+
+
+def _cached_subdirectories(path: Path) -> List[str]:
+    """Return _list_subdirectories(path), reused while the directory mtime is unchanged."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        _SUBDIR_CACHE.pop(path, None)
+        return []
+    cached = _SUBDIR_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    names = _list_subdirectories(path)
+    _SUBDIR_CACHE[path] = (mtime, names)
+    return names
+
+
 def _curses_choose_directory(
     base_path: str,
     feedback: str = "",
@@ -1364,99 +1884,114 @@ def _curses_choose_directory(
         return None
 
     def _draw(stdscr):
+        # curses.wrapper already enabled keypad mode on stdscr
         curses.curs_set(0)
-        stdscr.keypad(True)
+        # bind hot curses attributes once instead of per key press
+        addstr = stdscr.addstr
+        getch = stdscr.getch
+        a_reverse = curses.A_REVERSE
+        up_keys = (curses.KEY_UP, ord('k'))
+        down_keys = (curses.KEY_DOWN, ord('j'))
+        key_npage, key_ppage = curses.KEY_NPAGE, curses.KEY_PPAGE
+        key_home, key_end = curses.KEY_HOME, curses.KEY_END
+        key_resize = curses.KEY_RESIZE
+        nav_keys = _curses_nav_keys()
         current = base
         idx = 0
         top = 0
+        # redraw only after a key that can change the screen
+        dirty = True
+        last_idx = idx
         local_feedback = feedback
+        help_line = "↑/↓ move  Space/Enter open/select  m manual  o options  v version  q quit"
+        # entries are rebuilt only when the path or the comment setting changes
+        entries: List[Tuple[str, str]] = []  # (label, action)
+        entries_key: Optional[Tuple[Path, bool]] = None
+        # entry indexes whose guest comment has not been looked up yet
+        unlabeled: Set[int] = set()
         while True:
-            # build entries
-            try:
-                subs = []
-                for p in sorted(
-                    (p for p in current.iterdir() if p.is_dir()),
-                    key=lambda item: item.name.lower(),
-                ):
-                    if p.name.startswith('.'):
-                        continue
-                    if p.name == ".chunks":
-                        continue
-                    subs.append(p)
-            except PermissionError:
-                subs = []
-
-            entries: List[Tuple[str, str]] = []  # (label, action)
-            entries.append(("Use current path", "use"))
-            if current != base:
-                entries.append((".. (up one level)", "up"))
-            for p in subs:
-                label = p.name + "/"
-                if (
+            if dirty:
+                show_comments = bool(
                     datastore_name
                     and args is not None
                     and getattr(args, "show_comments", False)
-                ):
-                    comment = get_guest_comment_for_path(datastore_name, base, p)
-                    if comment:
-                        label = f"{label} | {comment}"
-                entries.append((label, f"enter:{p.name}"))
-
-            stdscr.erase()
-            h, w = stdscr.getmaxyx()
-            rel = "/" if current == base else "/" + str(current.relative_to(base))
-            header = f"{ICONS.get('folder_current','')} Current path: {rel}"
-            y = 0
-            try:
-                stdscr.addstr(y, 0, header[: max(1, w - 1)])
-            except Exception:
-                pass
-            y += 1
-            if local_feedback:
+                )
+                if entries_key != (current, show_comments):
+                    subs = _cached_subdirectories(current)
+                    entries = [("Use current path", "use")]
+                    if current != base:
+                        entries.append((".. (up one level)", "up"))
+                    first_sub = len(entries)
+                    entries.extend((name + "/", f"enter:{name}") for name in subs)
+                    # comments are looked up only once their row becomes visible
+                    unlabeled = set(range(first_sub, len(entries))) if show_comments else set()
+                    entries_key = (current, show_comments)
+                    rel = "/" if current == base else "/" + str(current.relative_to(base))
+
+                stdscr.erase()
+                h, w = stdscr.getmaxyx()
+                max_x = max(1, w - 1)  # usable row width
+                header = f"{ICONS.get('folder_current','')} Current path: {rel}"
+                y = 0
                 try:
-                    stdscr.addstr(y, 0, local_feedback[: max(1, w - 1)])
+                    addstr(y, 0, header[:max_x])
                 except Exception:
                     pass
                 y += 1
-
-            view_h = max(1, h - (y + 1))
-            if idx < top:
-                top = idx
-            if idx >= top + view_h:
-                top = max(0, idx - view_h + 1)
-            end = min(len(entries), top + view_h)
-            for i in range(top, end):
-                label = entries[i][0]
-                prefix = "> " if i == idx else "  "
-                text = (prefix + label)[: max(1, w - 1)]
+                if local_feedback:
+                    try:
+                        addstr(y, 0, local_feedback[:max_x])
+                    except Exception:
+                        pass
+                    y += 1
+
+                view_h = max(1, h - (y + 1))
+                if idx < top:
+                    top = idx
+                if idx >= top + view_h:
+                    top = max(0, idx - view_h + 1)
+                end = min(len(entries), top + view_h)
+                for i in range(top, end):
+                    if i in unlabeled:
+                        unlabeled.discard(i)
+                        label, action = entries[i]
+                        comment = get_guest_comment_for_path(
+                            datastore_name, base, current / action.split(":", 1)[1]
+                        )
+                        if comment:
+                            entries[i] = (f"{label} | {comment}", action)
+                    label = entries[i][0]
+                    prefix = "> " if i == idx else "  "
+                    text = (prefix + label)[:max_x]
+                    try:
+                        addstr(y + (i - top), 0, text, a_reverse if i == idx else 0)
+                    except Exception:
+                        pass
                 try:
-                    stdscr.addstr(y + (i - top), 0, text, curses.A_REVERSE if i == idx else 0)
+                    addstr(h - 1, 0, help_line[:max_x])
                 except Exception:
                     pass
-            help_line = "↑/↓ move  Space/Enter open/select  m manual  o options  v version  q quit"
-            try:
-                stdscr.addstr(h - 1, 0, help_line[: max(1, w - 1)])
-            except Exception:
-                pass
-            stdscr.refresh()
-            ch = stdscr.getch()
-            if ch in (curses.KEY_UP, ord('k')):
+                stdscr.refresh()
+                dirty = False
+                last_idx = idx
+            ch = getch()
+            if ch in up_keys:
                 if idx > 0:
                     idx -= 1
-            elif ch in (curses.KEY_DOWN, ord('j')):
+            elif ch in down_keys:
                 if idx < len(entries) - 1:
                     idx += 1
-            elif ch in (curses.KEY_NPAGE,):
+            elif ch == key_npage:
                 step = max(1, view_h - 1)
                 idx = min(len(entries) - 1, idx + step)
-            elif ch in (curses.KEY_PPAGE,):
+            elif ch == key_ppage:
                 step = max(1, view_h - 1)
                 idx = max(0, idx - step)
-            elif ch in (curses.KEY_HOME,):
+            elif ch == key_home:
                 idx = 0
-            elif ch in (curses.KEY_END,):
+            elif ch == key_end:
                 idx = len(entries) - 1
-            elif ch in (10, 13, ord(' ')):
+            elif ch in _KEYS_SELECT:
                 label, action = entries[idx]
                 if action == "use":
                     return str(current)
@@ -1466,8 +2001,7 @@ def _curses_choose_directory(
                         idx = 0
                         top = 0
                         local_feedback = ""
-                    continue
-                if action.startswith("enter:"):
+                elif action.startswith("enter:"):
                     name = action.split(":", 1)[1]
                     nxt = current / name
                     if nxt.is_dir():
@@ -1476,16 +2010,45 @@ def _curses_choose_directory(
                         top = 0
                         local_feedback = ""
                     else:
+                        entries_key = None
                         local_feedback = "Path no longer exists."
-                    continue
-            elif ch in (ord('m'), ord('M')):
-                return _CURSES_SENTINEL_MANUAL
-            elif ch in (ord('o'), ord('O')):
+            elif ch in _KEYS_MANUAL:
+                manual = _curses_popup(
+                    stdscr,
+                    "Manual path",
+                    [
+                        "Enter a path relative to the datastore root,",
+                        "e.g. /ns/MyNamespace.",
+                    ],
+                    prompt="Path: ",
+                )
+                if manual:
+                    abs_path = base / manual.lstrip("/")
+                    if abs_path.is_dir():
+                        return str(abs_path)
+                    local_feedback = "Path does not exist. Please try again."
+                else:
+                    local_feedback = "No path entered. Please try again."
+            elif ch in _KEYS_OPTIONS:
                 _invoke_options_handler(stdscr)
-            elif ch in (ord('v'), ord('V')):
+            elif ch in _KEYS_VERSION:
                 _invoke_version_handler(stdscr)
-            elif ch in (ord('q'), ord('Q'), 27):
+            elif ch in _KEYS_QUIT:
                 return None
+            elif ch != key_resize:
+                continue
+            # moving the selection alone only repaints two rows
+            if ch not in nav_keys:
+                dirty = True
+            if not dirty and idx != last_idx:
+                if top <= idx < top + view_h:
+                    _curses_repaint_rows(stdscr, max_x, (
+                        (y + last_idx - top, "  " + entries[last_idx][0], 0),
+                        (y + idx - top, "> " + entries[idx][0], a_reverse),
+                    ))
+                    last_idx = idx
+                else:
+                    dirty = True
     try:
         return curses.wrapper(_draw)  # type: ignore[attr-defined]
     except Exception:
@@ -1507,28 +2070,12 @@ def _choose_directory(
         return None
 
     if _want_curses_ui():
-        feedback = ""
-        while True:
-            res = _curses_choose_directory(base_path, feedback, datastore_name, args)
-            if res == _CURSES_SENTINEL_MANUAL:
-                clear_console()
-                manual_prompt = (
-                    "Enter relative path from datastore "
-                    "(e.g. /ns/MyNamespace): "
-                )
-                manual = input(manual_prompt).strip()
-                if manual:
-                    manual = manual.lstrip("/")
-                    abs_path = base / manual
-                    if abs_path.is_dir():
-                        return str(abs_path)
-                    feedback = "Path does not exist. Please try again."
-                else:
-                    feedback = "No path entered. Please try again."
-                continue
-            return res
+        # Manual entry is handled inside the curses session.
+        return _curses_choose_directory(base_path, "", datastore_name, args)
 
     # Fallback: simple text browser
+    options_handler = _UI_OPTIONS_HANDLER
+    version_handler = _UI_VERSION_HANDLER
     current = base
     feedback = ""
     while True:
@@ -1539,37 +2086,26 @@ def _choose_directory(
             print(f"{feedback}\n")
             feedback = ""
         # List subdirs (skip hidden and .chunks by default)
-        subs = []
-        try:
-            for p in sorted(
-                (p for p in current.iterdir() if p.is_dir()),
-                key=lambda item: item.name.lower(),
-            ):
-                if p.name.startswith('.'):
-                    continue
-                if p.name == ".chunks":
-                    continue
-                subs.append(p)
-        except PermissionError:
-            subs = []
+        subs = [current / name for name in _cached_subdirectories(current)]
 
         print("Select a directory:")
         print("  0) Use current path")
+        show_comments = bool(
+            datastore_name
+            and args is not None
+            and getattr(args, "show_comments", False)
+        )
         for i, p in enumerate(subs, 1):
             label = p.name
-            if (
-                datastore_name
-                and args is not None
-                and getattr(args, "show_comments", False)
-            ):
+            if show_comments:
                 comment = get_guest_comment_for_path(datastore_name, base, p)
                 if comment:
                     label = f"{p.name}/ | {comment}"
             print(f"  {i}) {label}")
         extra_cmds = ["u = go up one level"]
-        if _UI_OPTIONS_HANDLER is not None:
+        if options_handler is not None:
             extra_cmds.append("o = options")
-        if _UI_VERSION_HANDLER is not None:
+        if version_handler is not None:
             extra_cmds.append("v = version")
         extra_cmds.append("m = enter path manually")
         extra_cmds.append("q = quit")
@@ -1582,11 +2118,11 @@ def _choose_directory(
             if current != base:
                 current = current.parent
             continue
-        if choice == "o" and _UI_OPTIONS_HANDLER is not None:
-            _invoke_options_handler(None)
+        if choice == "o" and options_handler is not None:
+            options_handler(None)
             continue
-        if choice == "v" and _UI_VERSION_HANDLER is not None:
-            _invoke_version_handler(None)
+        if choice == "v" and version_handler is not None:
+            version_handler(None)
             continue
         if choice == "m":
             clear_console()
@@ -1618,53 +2154,105 @@ def _choose_directory(
 # Chunk extraction from index files
 # =============================================================================
 
-_HEX64 = re.compile(r'"?([A-Fa-f0-9]{64})"?')
+_HEX64 = re.compile(r'(?<![A-Fa-f0-9])[A-Fa-f0-9]{64}(?![A-Fa-f0-9])')
+
+# On-disk index layout (proxmox-backup pbs-datastore): a 4096-byte header
+# starting with an 8-byte magic, followed by 32-byte digests (fixed index) or
+# by 40-byte entries of little-endian end offset + digest (dynamic index).
+_INDEX_HEADER_SIZE = 4096
+_FIXED_INDEX_MAGIC = bytes([47, 127, 65, 237, 145, 253, 15, 205])
+_DYNAMIC_INDEX_MAGIC = bytes([28, 145, 78, 165, 25, 186, 179, 205])
+_DIGEST_SIZE = 32
+_DYNAMIC_ENTRY_SIZE = 40
+
+# Set once proxmox-backup-debug turned out to be missing, so later index files
+# fail fast instead of trying to spawn it again.
+_INSPECT_UNAVAILABLE = False
+
+
+def _read_index_digests(index_file: str) -> Optional[Set[bytes]]:
+    """Read chunk digests straight from a .fidx/.didx file.
 
-def _parse_chunks_from_text(output: str) -> Set[str]:
+    Returns None when the file cannot be read or does not look like a known
+    index format, so callers can fall back to `proxmox-backup-debug`.
+    The file is memory-mapped and digests are sliced straight from the mapping.
+    """
+    try:
+        fd = os.open(index_file, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        if size < _INDEX_HEADER_SIZE:
+            return None
+        with mmap.mmap(fd, size, prot=mmap.PROT_READ) as mm:
+            magic = mm[:8]
+            if magic == _FIXED_INDEX_MAGIC:
+                start, step = _INDEX_HEADER_SIZE, _DIGEST_SIZE
+            elif magic == _DYNAMIC_INDEX_MAGIC:
+                start, step = _INDEX_HEADER_SIZE + 8, _DYNAMIC_ENTRY_SIZE
+            else:
+                return None
+            if (size - _INDEX_HEADER_SIZE) % step:
+                return None
+            # entries are read front to back; let page faults trigger readahead
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                digests = {view[i:i + _DIGEST_SIZE].tobytes() for i in range(start, size, step)}
+        return digests
+    except (OSError, ValueError):
+        return None
+    finally:
+        os.close(fd)
+
+
+def _parse_chunks_from_text(output: str) -> Set[bytes]:
     """Extract chunk digests from text output of `proxmox-backup-debug inspect file`."""
-    chunks: Set[str] = set()
-    in_chunks = False
-    for line in output.splitlines():
-        if not in_chunks:
-            if line.strip().startswith("chunks:"):
-                in_chunks = True
-            continue
-        m = _HEX64.search(line)
-        if m:
-            chunks.add(m.group(1).lower())
-    return chunks
+    start = output.find("chunks:")
+    if start < 0:
+        return set()
+    # one regex pass over everything after the marker instead of per-line searches
+    return {bytes.fromhex(digest) for digest in _HEX64.findall(output, start)}
 
 
-def _parse_chunks_from_json(output: str) -> Optional[Set[str]]:
+def _parse_chunks_from_json(output: str) -> Optional[Set[bytes]]:
     """Extract chunk digests from JSON output of `proxmox-backup-debug inspect file`.
 
-    Returns a set of lowercase 64-hex digests, or None if parsing fails.
+    Returns a set of raw 32-byte digests, or None if parsing fails.
     """
     try:
         data = json.loads(output)
     except json.JSONDecodeError:
         return None
 
-    chunks = set()
+    chunks: Set[bytes] = set()
     if isinstance(data, dict) and "chunks" in data:
         for item in data.get("chunks", []):
             digest = item.get("digest")
-            if (
-                isinstance(digest, str)
-                and len(digest) == 64
-                and all(c in "0123456789abcdefABCDEF" for c in digest)
-            ):
-                chunks.add(digest.lower())
+            if isinstance(digest, str) and len(digest) == 64:
+                try:
+                    chunks.add(bytes.fromhex(digest))
+                except ValueError:
+                    continue
         return chunks
     return None
 
 
-def extract_chunks_from_file(index_file: str) -> Set[str]:
-    """Return the set of chunk digests referenced by an index file.
+def extract_chunks_from_file(index_file: str) -> Set[bytes]:
+    """Return the set of raw chunk digests referenced by an index file.
 
-    Tries JSON output first (faster, structured), falling back to text parsing
-    if JSON is unavailable or malformed.
+    Reads the index file directly when its format is recognized. Otherwise
+    asks `proxmox-backup-debug inspect`, trying JSON output first (faster,
+    structured) and falling back to text parsing if JSON is unavailable or
+    malformed. Set PBS_CC_TEXT_FALLBACK=0 to skip the text attempt.
     """
+    global _INSPECT_UNAVAILABLE
+    direct = _read_index_digests(index_file)
+    if direct is not None:
+        return direct
+    if _INSPECT_UNAVAILABLE:
+        raise RuntimeError("Required command 'proxmox-backup-debug' not available.")
+
     try:
         cp = run_cmd(
             [
@@ -1693,8 +2281,12 @@ def extract_chunks_from_file(index_file: str) -> Set[str]:
             f"timed out while inspecting {index_file} (json).\n"
         )
     except FileNotFoundError:
+        _INSPECT_UNAVAILABLE = True
         raise RuntimeError("Required command 'proxmox-backup-debug' not available.") from None
 
+    if os.environ.get("PBS_CC_TEXT_FALLBACK") == "0":
+        return set()
+
     try:
         cp_text = run_cmd(
             [
@@ -1715,6 +2307,7 @@ def extract_chunks_from_file(index_file: str) -> Set[str]:
         )
         return set()
     except FileNotFoundError:
+        _INSPECT_UNAVAILABLE = True
         raise RuntimeError("Required command 'proxmox-backup-debug' not available.") from None
 
     if cp_text.returncode != 0:
@@ -1728,36 +2321,135 @@ def extract_chunks_from_file(index_file: str) -> Set[str]:
     return _parse_chunks_from_text(cp_text.stdout or "")
 
 
+# Upper bound on index files per parse task; larger batches only coarsen progress.
+_PARSE_BATCH_MAX = 64
+
+
+def _extract_chunks_batch(
+    index_files: List[str],
+) -> List[Tuple[str, Optional[Set[bytes]], str]]:
+    """Parse several index files in one pool task.
+
+    Returns (index_file, digests, error) per file; digests is None when the file
+    failed, so one bad file does not discard the rest of the batch.
+    """
+    results: List[Tuple[str, Optional[Set[bytes]], str]] = []
+    for index_file in index_files:
+        try:
+            results.append((index_file, extract_chunks_from_file(index_file), ""))
+        except Exception as e:
+            results.append((index_file, None, str(e)))
+    return results
+
+
 # =============================================================================
 # Chunk size lookup and aggregation
 # =============================================================================
 
-def chunk_path_for_digest(chunks_root: str, digest: str) -> Path:
-    """Compute filesystem path of a chunk file from its digest."""
-    return Path(chunks_root) / digest[:4] / digest
+_STAT_BATCH_SIZE = 4096
+# More concurrent stat() calls than this only add VFS lock and GIL contention;
+# it is roughly where typical NVMe queues saturate.
+_STAT_MAX_WORKERS = 8
+# Entries kept in a cross-guest chunk size cache (roughly 35 MB when full);
+# kept small so --all-guests does not grow the footprint much on the backup host.
+_SIZE_CACHE_MAX = 250_000
+
+
+def _stat_batch_size(total: int, threads: int) -> int:
+    """Return the number of chunks per stat task.
+
+    Large enough to amortize per-future overhead, small enough that every
+    worker thread still gets several batches.
+    """
+    per_worker = -(-total // max(1, threads * 4))
+    return max(1, min(_STAT_BATCH_SIZE, per_worker))
 
 
-def stat_size_if_exists(path: Path) -> int:
-    """Return file size in bytes or 0 if the path does not exist or is inaccessible."""
+def _stat_chunk_batch(chunks_root: Path, digests: Sequence[bytes]) -> Tuple[List[int], List[str]]:
+    """Stat the chunk files for a batch of digests.
+
+    Returns (sizes, missing): sizes is aligned with digests (0 for missing or
+    inaccessible chunks), missing lists the paths of chunk files that do not
+    exist. A single stat per chunk both sizes it and detects its absence.
+    Digests are hex-encoded only here; paths are built by plain string
+    concatenation, which is much cheaper than Path arithmetic in this loop.
+    Stats are relative to a directory fd of chunks_root so the kernel does not
+    walk the full datastore path for every chunk. Callers pass sorted digests
+    so consecutive stats hit the same shard directory.
+    """
+    sizes: List[int] = []
+    missing: List[str] = []
+    stat = os.stat
+    sep = os.sep
+    root = os.fspath(chunks_root) + sep
     try:
-        st = path.stat()
-        return int(st.st_size)
-    except FileNotFoundError:
-        return 0
-    except OSError as exc:
-        sys.stderr.write(f"{ICONS['warning']} Warning: unable to access chunk file {path}: {exc}\n")
-        return 0
+        root_fd: Optional[int] = os.open(root, os.O_RDONLY | os.O_DIRECTORY)
+        base = ""
+    except OSError:
+        root_fd = None
+        base = root
+    try:
+        for digest in digests:
+            hex_digest = digest.hex()
+            rel = hex_digest[:4] + sep + hex_digest
+            try:
+                sizes.append(stat(base + rel, dir_fd=root_fd).st_size)
+            except FileNotFoundError:
+                sizes.append(0)
+                missing.append(root + rel)
+            except OSError as exc:
+                sizes.append(0)
+                sys.stderr.write(
+                    f"{ICONS['warning']} Warning: unable to access chunk file {root + rel}: {exc}\n"
+                )
+    finally:
+        if root_fd is not None:
+            os.close(root_fd)
+    return sizes, missing
+
+
+def _remember_chunk_sizes(
+    size_cache: Dict[bytes, int], digests: Sequence[bytes], sizes: Sequence[int]
+) -> None:
+    """Add stat results to a cross-guest size cache until it is full.
+
+    Missing or unreadable chunks (size 0) are not cached, so they are stat'ed
+    and reported again for every guest referencing them.
+    """
+    if len(size_cache) < _SIZE_CACHE_MAX:
+        size_cache.update((d, size) for d, size in zip(digests, sizes) if size)
 
 
 # =============================================================================
 # Progress rendering utilities
 # =============================================================================
 
+_PROGRESS_LINE_START = "\r\033[K"
+_PROGRESS_INTERVAL = 0.1  # seconds between in-place progress redraws
+_progress_last_emit = 0.0
+
+
+def _progress_due(i: int, total: int) -> bool:
+    """Return True when a progress line should be redrawn.
+
+    Redraws are throttled to one per _PROGRESS_INTERVAL; the final step is
+    always drawn so the line ends on the real totals.
+    """
+    global _progress_last_emit
+    now = time.monotonic()
+    if i < total and now - _progress_last_emit < _PROGRESS_INTERVAL:
+        return False
+    _progress_last_emit = now
+    return True
+
+
 def _progress_line(prefix: str, i: int, total: int, extra: str = "") -> None:
     """Render a single in-place progress line with percentage and optional extras."""
+    if _SILENT:
+        return
     pct = (i / total * 100.0) if total else 0.0
-    msg = f"\r\033[K{prefix} {i}/{total} ({pct:6.2f}%) {extra}"
-    print(msg, end="", flush=True)
+    sys.stdout.write(f"{_PROGRESS_LINE_START}{prefix} {i}/{total} ({pct:6.2f}%) {extra}")
+    sys.stdout.flush()
 
 
 # =============================================================================
@@ -1784,112 +2476,198 @@ class SnapshotResult(NamedTuple):
     shared_chunks: int
 
 
+@contextlib.contextmanager
+def _cancel_on_interrupt(*executors: Optional[futures.Executor]) -> Iterator[None]:
+    """Cancel queued work on Ctrl+C so pool shutdown only waits for running tasks."""
+    try:
+        yield
+    except KeyboardInterrupt:
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
 def analyze_search_path(
     search_path_obj: Path,
     chunks_root: Path,
     threads: int,
     timer_base: Optional[float] = None,
     progress_label: str = "",
+    parse_pool: Optional[futures.Executor] = None,
+    stat_pool: Optional[futures.Executor] = None,
+    size_cache: Optional[Dict[bytes, int]] = None,
 ) -> UsageResult:
-    """Analyze a single search path and return usage statistics."""
-    analysis_start = time.time()
+    """Analyze a single search path and return usage statistics.
+
+    Callers analyzing many paths can pass long-lived parse/stat executors;
+    otherwise both are created for this call and shut down afterwards. They can
+    also share a size_cache so chunks already stat'ed for an earlier path are
+    not stat'ed again.
+    """
+    analysis_start = time.monotonic()
     progress_start = timer_base if timer_base is not None else analysis_start
     label_suffix = f" [{progress_label.strip()}]" if progress_label.strip() else ""
+    index_prefix = f"{ICONS['index']} Index{label_suffix}"
+    chunk_prefix = f"{ICONS['chunk']} Chunk{label_suffix}"
 
     index_files = find_index_files(str(search_path_obj))
     total_files = len(index_files)
     if total_files == 0:
         print(f"{ICONS['info']} No index files (*.fidx/*.didx) found.")
-        return UsageResult(0, 0, 0, 0, 0, 0, time.time() - analysis_start)
+        return UsageResult(0, 0, 0, 0, 0, 0, time.monotonic() - analysis_start)
 
     print(f"\n{ICONS['save']} Saving all used chunks{label_suffix}")
 
-    digest_counter = Counter()
+    # Most digests are referenced once, so only repeat references are counted;
+    # a digest's occurrences are 1 + dup_counts[digest].
+    seen: Set[bytes] = set()
+    dup_counts: Counter = Counter()
+    chunk_counter_total = 0
+    stat_futs: Dict[futures.Future, List[bytes]] = {}
+    pending: List[bytes] = []
+    cached_hits: List[bytes] = []
     processed = 0
-    with futures.ThreadPoolExecutor(max_workers=threads) as pool:
-        futs = {pool.submit(extract_chunks_from_file, f): f for f in index_files}
-        for fut in futures.as_completed(futs):
-            try:
-                digests = fut.result()
-                digest_counter.update(digests)
-            except Exception as e:
-                sys.stderr.write(
-                    f"\n{ICONS['warning']} Warning: failed to parse "
-                    f"{futs[fut]}: {e}\n"
-                )
-            processed += 1
-            elapsed_display = format_elapsed(time.time() - progress_start)
-            prefix = f"{ICONS['index']} Index{label_suffix}"
-            _progress_line(
-                prefix,
-                processed,
-                total_files,
-                f"| {ICONS['timer']} {elapsed_display}",
-            )
-
-    print()
-
-    chunk_counter_total = sum(digest_counter.values())
-    total_unique = len(digest_counter)
-
-    if total_unique == 0:
-        print(f"{ICONS['info']} No chunks referenced. Nothing to sum.")
-        elapsed_total = time.time() - analysis_start
-        return UsageResult(total_files, 0, chunk_counter_total, 0, 0, 0, elapsed_total)
-
-    print(f"{ICONS['sum']} Summing up chunks{label_suffix}")
-
     missing_count = 0
     unique_bytes = 0
     duplicate_bytes = 0
     summed = 0
+    stat_workers = min(threads, _STAT_MAX_WORKERS)
+
+    def _submit_pending() -> None:
+        if size_cache:
+            misses: List[bytes] = []
+            for digest in pending:
+                (cached_hits if digest in size_cache else misses).append(digest)
+            pending[:] = misses
+        # sorted digests are grouped by shard directory, keeping stats local
+        pending.sort()
+        # split so every stat worker gets several batches, also for small flushes
+        batch_size = _stat_batch_size(len(pending), stat_workers)
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
+            stat_futs[stat_pool.submit(_stat_chunk_batch, chunks_root, batch)] = batch
+        pending.clear()
+
+    # Chunks are queued for stat as soon as their digest is first seen, so the
+    # stat phase overlaps index parsing instead of waiting for all files.
+    with contextlib.ExitStack() as stack:
+        if stat_pool is None:
+            stat_pool = stack.enter_context(
+                futures.ThreadPoolExecutor(max_workers=stat_workers)
+            )
+        if parse_pool is None:
+            parse_pool = stack.enter_context(futures.ThreadPoolExecutor(max_workers=threads))
+        stack.enter_context(_cancel_on_interrupt(parse_pool, stat_pool))
+        # files are handed out in batches, so large sweeps need one future (and
+        # one worker round trip) per batch instead of per file
+        batch_size = max(1, min(_PARSE_BATCH_MAX, total_files // (threads * 4)))
+        futs = {
+            parse_pool.submit(_extract_chunks_batch, batch): batch
+            for batch in (
+                index_files[i:i + batch_size] for i in range(0, total_files, batch_size)
+            )
+        }
+        for fut in futures.as_completed(futs):
+            try:
+                results = fut.result()
+            except Exception as e:
+                results = [(f, None, str(e)) for f in futs[fut]]
+            del futs[fut]
+            for index_file, file_digests, error in results:
+                if file_digests is None:
+                    sys.stderr.write(
+                        f"\n{ICONS['warning']} Warning: failed to parse "
+                        f"{index_file}: {error}\n"
+                    )
+                else:
+                    shared = file_digests & seen
+                    if shared:
+                        dup_counts.update(shared)
+                        file_digests -= shared
+                    seen |= file_digests
+                    chunk_counter_total += len(file_digests) + len(shared)
+                    pending.extend(file_digests)
+                    if len(pending) >= _STAT_BATCH_SIZE:
+                        _submit_pending()
+                processed += 1
+                if _progress_due(processed, total_files):
+                    elapsed_display = format_elapsed(time.monotonic() - progress_start)
+                    _progress_line(
+                        index_prefix,
+                        processed,
+                        total_files,
+                        f"| {ICONS['timer']} {elapsed_display}",
+                    )
+
+        _submit_pending()
 
-    def _stat_one(digest: str) -> Tuple[int, bool]:
-        path = chunk_path_for_digest(chunks_root, digest)
-        size = stat_size_if_exists(path)
-        missing = (size == 0 and not path.exists())
-        return size, missing
+        print()
 
-    with futures.ThreadPoolExecutor(max_workers=threads) as pool:
-        futs2 = {pool.submit(_stat_one, d): d for d in digest_counter.keys()}
-        for fut in futures.as_completed(futs2):
+        total_unique = len(seen)
+
+        if total_unique == 0:
+            print(f"{ICONS['info']} No chunks referenced. Nothing to sum.")
+            elapsed_total = time.monotonic() - analysis_start
+            return UsageResult(total_files, 0, chunk_counter_total, 0, 0, 0, elapsed_total)
+
+        print(f"{ICONS['sum']} Summing up chunks{label_suffix}")
+
+        # All index files are parsed at this point, so occurrence counts are final.
+        for digest in cached_hits:
+            size = size_cache[digest]
+            unique_bytes += size
+            extra_refs = dup_counts.get(digest)
+            if extra_refs:
+                duplicate_bytes += size * extra_refs
+        summed += len(cached_hits)
+        if not stat_futs:
+            # every size came from size_cache; still draw the final count
+            _progress_line(
+                chunk_prefix,
+                summed,
+                total_unique,
+                f"| {ICONS['total']} Size so far: {human_readable_size(unique_bytes)} "
+                f"| {ICONS['timer']} {format_elapsed(time.monotonic() - progress_start)}",
+            )
+        for fut in futures.as_completed(stat_futs):
+            batch = stat_futs.pop(fut)
             try:
-                size, missing = fut.result()
-                unique_bytes += size
-                occurrences = digest_counter[futs2[fut]]
-                if occurrences > 1 and size:
-                    duplicate_bytes += size * (occurrences - 1)
-                if missing:
+                sizes, missing = fut.result()
+                for digest, size in zip(batch, sizes):
+                    unique_bytes += size
+                    extra_refs = dup_counts.get(digest)
+                    if extra_refs and size:
+                        duplicate_bytes += size * extra_refs
+                if size_cache is not None:
+                    _remember_chunk_sizes(size_cache, batch, sizes)
+                for path in missing:
                     missing_count += 1
-                    print(
-                        f"\r\033[K{ICONS['missing']} Missing: "
-                        f"{chunk_path_for_digest(chunks_root, futs2[fut])}",
-                        flush=True,
-                    )
+                    print(f"\r\033[K{ICONS['missing']} Missing: {path}", flush=True)
             except Exception as e:
                 sys.stderr.write(
-                    f"\n{ICONS['warning']} Warning: failed to stat chunk "
-                    f"{futs2[fut]}: {e}\n"
+                    f"\n{ICONS['warning']} Warning: failed to stat chunk batch "
+                    f"starting at {batch[0].hex()}: {e}\n"
+                )
+            summed += len(batch)
+            if _progress_due(summed, total_unique):
+                elapsed_display = format_elapsed(time.monotonic() - progress_start)
+                size_label = human_readable_size(unique_bytes)
+                extra = (
+                    f"| {ICONS['total']} Size so far: {size_label} "
+                    f"| {ICONS['timer']} {elapsed_display}"
+                )
+                _progress_line(
+                    chunk_prefix,
+                    summed,
+                    total_unique,
+                    extra,
                 )
-            summed += 1
-            elapsed_display = format_elapsed(time.time() - progress_start)
-            prefix = f"{ICONS['chunk']} Chunk{label_suffix}"
-            size_label = human_readable_size(unique_bytes)
-            extra = (
-                f"| {ICONS['total']} Size so far: {size_label} "
-                f"| {ICONS['timer']} {elapsed_display}"
-            )
-            _progress_line(
-                prefix,
-                summed,
-                total_unique,
-                extra,
-            )
 
     print()
     print("\033[2K", end="")
 
-    elapsed_total = time.time() - analysis_start
+    elapsed_total = time.monotonic() - analysis_start
     return UsageResult(
         total_files,
         total_unique,
@@ -1902,15 +2680,18 @@ def analyze_search_path(
 
 
 def print_usage_summary(result: UsageResult, elapsed_seconds: float) -> None:
-    """Render the summary table for a UsageResult."""
+    """Render the summary table for a UsageResult.
+
+    The block is assembled first and written with a single print call.
+    """
     total_human = human_readable_size(result.unique_bytes)
-    print(
+    lines = [
         f"{ICONS['total']} Total size: {result.unique_bytes} Bytes "
         f"({total_human})"
-    )
+    ]
 
     total_elapsed = format_elapsed(elapsed_seconds)
-    print(f"{ICONS['timer']} Evaluation duration: {total_elapsed}")
+    lines.append(f"{ICONS['timer']} Evaluation duration: {total_elapsed}")
 
     duplicate_count = result.total_references - result.unique_chunks
     if result.total_references:
@@ -1919,7 +2700,7 @@ def print_usage_summary(result: UsageResult, elapsed_seconds: float) -> None:
     else:
         unique_percent = 0.0
         duplicate_percent = 0.0
-    print(f"{ICONS['puzzle']} Chunk usage summary:")
+    lines.append(f"{ICONS['puzzle']} Chunk usage summary:")
     # Align summary values in table-like columns
     label_unique = "Unique chunks"
     label_dupe = "Duplicate refs"
@@ -1939,24 +2720,26 @@ def print_usage_summary(result: UsageResult, elapsed_seconds: float) -> None:
     w_perc = max(len(perc_unique), len(perc_dupe), len(perc_total))
     w_size = max(len(size_unique), len(size_dupe), len(size_total))
 
-    print(
+    lines.append(
         "  "
         f"{label_unique.ljust(w_label)} : {count_unique.rjust(w_count)}  "
         f"{perc_unique.rjust(w_perc)} | {size_unique.rjust(w_size)}"
     )
-    print(
+    lines.append(
         "  "
         f"{label_dupe.ljust(w_label)} : {count_dupe.rjust(w_count)}  "
         f"{perc_dupe.rjust(w_perc)} | {size_dupe.rjust(w_size)}"
     )
-    print(
+    lines.append(
         "  "
         f"{label_total.ljust(w_label)} : {count_total.rjust(w_count)}  "
         f"{perc_total.rjust(w_perc)} | {size_total.rjust(w_size)}"
     )
 
     if result.missing_chunks:
-        print(f"{ICONS['warning']} Missing chunk files: {result.missing_chunks}")
+        lines.append(f"{ICONS['warning']} Missing chunk files: {result.missing_chunks}")
+
+    print("\n".join(lines))
 
 
 def _parse_snapshot_name(name: str) -> Tuple[str, float]:
@@ -1982,35 +2765,40 @@ def analyze_guest_per_snapshot(
     threads: int,
     timer_base: Optional[float] = None,
     progress_label: str = "",
+    stat_pool: Optional[futures.Executor] = None,
+    size_cache: Optional[Dict[bytes, int]] = None,
 ) -> Tuple[UsageResult, List[SnapshotResult]]:
     """Analyze a guest path and return per-snapshot usage statistics.
 
     The overall UsageResult is computed exactly like analyze_search_path so that
     the summary output remains identical. Per-snapshot breakdowns are computed as
-    additional data.
+    additional data. A long-lived stat executor and a shared size_cache may be
+    passed in by callers analyzing many guests.
     """
-    analysis_start = time.time()
+    analysis_start = time.monotonic()
     progress_start = timer_base if timer_base is not None else analysis_start
     label_suffix = f" [{progress_label.strip()}]" if progress_label.strip() else ""
+    index_prefix = f"{ICONS['index']} Index{label_suffix}"
+    chunk_prefix = f"{ICONS['chunk']} Chunk{label_suffix}"
 
     index_files = find_index_files(str(guest_path))
     total_files = len(index_files)
     if total_files == 0:
         return (
-            UsageResult(0, 0, 0, 0, 0, 0, time.time() - analysis_start),
+            UsageResult(0, 0, 0, 0, 0, 0, time.monotonic() - analysis_start),
             [],
         )
 
     snapshot_groups = group_index_files_by_snapshot(index_files)
     if not snapshot_groups:
         return (
-            UsageResult(0, 0, 0, 0, 0, 0, time.time() - analysis_start),
+            UsageResult(0, 0, 0, 0, 0, 0, time.monotonic() - analysis_start),
             [],
         )
 
     # Build per-snapshot digest sets AND a global occurrence counter
-    all_digests: Set[str] = set()
-    snapshot_digests: Dict[str, Set[str]] = {}
+    all_digests: Set[bytes] = set()
+    snapshot_digests: Dict[str, Set[bytes]] = {}
     digest_counter = Counter()
     snapshot_digest_counters: Dict[str, Counter] = {}
 
@@ -2018,7 +2806,7 @@ def analyze_guest_per_snapshot(
 
     processed = 0
     for snapshot_name in snapshot_groups:
-        digests: Set[str] = set()
+        digests: Set[bytes] = set()
         snap_counter = Counter()
         for idx_file in snapshot_groups[snapshot_name]:
             try:
@@ -2031,14 +2819,14 @@ def analyze_guest_per_snapshot(
                     f"\n{ICONS['warning']} Warning: failed to parse {idx_file}: {e}\n"
                 )
             processed += 1
-            elapsed_display = format_elapsed(time.time() - progress_start)
-            prefix = f"{ICONS['index']} Index{label_suffix}"
-            _progress_line(
-                prefix,
-                processed,
-                total_files,
-                f"| {ICONS['timer']} {elapsed_display}",
-            )
+            if _progress_due(processed, total_files):
+                elapsed_display = format_elapsed(time.monotonic() - progress_start)
+                _progress_line(
+                    index_prefix,
+                    processed,
+                    total_files,
+                    f"| {ICONS['timer']} {elapsed_display}",
+                )
         snapshot_digests[snapshot_name] = digests
         snapshot_digest_counters[snapshot_name] = snap_counter
         all_digests.update(digests)
@@ -2047,7 +2835,7 @@ def analyze_guest_per_snapshot(
 
     if not all_digests:
         return (
-            UsageResult(total_files, 0, 0, 0, 0, 0, time.time() - analysis_start),
+            UsageResult(total_files, 0, 0, 0, 0, 0, time.monotonic() - analysis_start),
             [],
         )
 
@@ -2056,64 +2844,90 @@ def analyze_guest_per_snapshot(
     print(f"{ICONS['sum']} Summing up chunks{label_suffix}")
 
     # Determine which digests appear in multiple snapshots (cross-snapshot sharing)
-    digest_snapshot_count: Dict[str, int] = Counter()
+    digest_snapshot_count: Dict[bytes, int] = Counter()
     for snapshot_name, digests in snapshot_digests.items():
         for d in digests:
             digest_snapshot_count[d] += 1
 
-    def _stat_chunk(digest: str) -> Tuple[str, int]:
-        path = chunk_path_for_digest(chunks_root, digest)
-        size = stat_size_if_exists(path)
-        return digest, size
-
-    digest_sizes: Dict[str, int] = {}
+    digest_sizes: Dict[bytes, int] = {}
     missing_count = 0
     unique_bytes = 0
     duplicate_bytes = 0
+    summed = 0
 
-    with futures.ThreadPoolExecutor(max_workers=threads) as pool:
-        futs = {pool.submit(_stat_chunk, d): d for d in digest_counter.keys()}
-        summed = 0
+    digest_list = sorted(digest_counter)
+    if size_cache:
+        to_stat: List[bytes] = []
+        for digest in digest_list:
+            size = size_cache.get(digest)
+            if size is None:
+                to_stat.append(digest)
+                continue
+            digest_sizes[digest] = size
+            unique_bytes += size
+            occurrences = digest_counter[digest]
+            if occurrences > 1:
+                duplicate_bytes += size * (occurrences - 1)
+        summed = total_unique - len(to_stat)
+        digest_list = to_stat
+    stat_workers = min(threads, _STAT_MAX_WORKERS)
+    batch_size = _stat_batch_size(len(digest_list), stat_workers)
+    batches = [digest_list[i:i + batch_size] for i in range(0, len(digest_list), batch_size)]
+
+    with contextlib.ExitStack() as stack:
+        if stat_pool is None:
+            stat_pool = stack.enter_context(futures.ThreadPoolExecutor(max_workers=stat_workers))
+        stack.enter_context(_cancel_on_interrupt(stat_pool))
+        futs = {stat_pool.submit(_stat_chunk_batch, chunks_root, batch): batch for batch in batches}
+        if not futs:
+            # every size came from size_cache; still draw the final count
+            _progress_line(
+                chunk_prefix,
+                summed,
+                total_unique,
+                f"| {ICONS['total']} Size so far: {human_readable_size(unique_bytes)} "
+                f"| {ICONS['timer']} {format_elapsed(time.monotonic() - progress_start)}",
+            )
         for fut in futures.as_completed(futs):
+            batch = futs[fut]
             try:
-                digest, size = fut.result()
-                digest_sizes[digest] = size
-                unique_bytes += size
-                occurrences = digest_counter[futs[fut]]
-                if occurrences > 1 and size:
-                    duplicate_bytes += size * (occurrences - 1)
-                if size == 0:
-                    path = chunk_path_for_digest(chunks_root, futs[fut])
-                    if not path.exists():
-                        missing_count += 1
-                        print(
-                            f"\r\033[K{ICONS['missing']} Missing: {path}",
-                            flush=True,
-                        )
+                sizes, missing = fut.result()
+                for digest, size in zip(batch, sizes):
+                    digest_sizes[digest] = size
+                    unique_bytes += size
+                    occurrences = digest_counter[digest]
+                    if occurrences > 1 and size:
+                        duplicate_bytes += size * (occurrences - 1)
+                if size_cache is not None:
+                    _remember_chunk_sizes(size_cache, batch, sizes)
+                for path in missing:
+                    missing_count += 1
+                    print(f"\r\033[K{ICONS['missing']} Missing: {path}", flush=True)
             except Exception as e:
                 sys.stderr.write(
-                    f"\n{ICONS['warning']} Warning: failed to stat chunk {futs[fut]}: {e}\n"
+                    f"\n{ICONS['warning']} Warning: failed to stat chunk batch "
+                    f"starting at {batch[0].hex()}: {e}\n"
+                )
+            summed += len(batch)
+            if _progress_due(summed, total_unique):
+                elapsed_display = format_elapsed(time.monotonic() - progress_start)
+                size_label = human_readable_size(unique_bytes)
+                extra = (
+                    f"| {ICONS['total']} Size so far: {size_label} "
+                    f"| {ICONS['timer']} {elapsed_display}"
+                )
+                _progress_line(
+                    chunk_prefix,
+                    summed,
+                    total_unique,
+                    extra,
                 )
-            summed += 1
-            elapsed_display = format_elapsed(time.time() - progress_start)
-            size_label = human_readable_size(unique_bytes)
-            prefix = f"{ICONS['chunk']} Chunk{label_suffix}"
-            extra = (
-                f"| {ICONS['total']} Size so far: {size_label} "
-                f"| {ICONS['timer']} {elapsed_display}"
-            )
-            _progress_line(
-                prefix,
-                summed,
-                total_unique,
-                extra,
-            )
 
     print()
     print("\033[2K", end="")
 
     chunk_counter_total = sum(digest_counter.values())
-    elapsed_total = time.time() - analysis_start
+    elapsed_total = time.monotonic() - analysis_start
     overall = UsageResult(
         index_files=total_files,
         unique_chunks=total_unique,
@@ -2177,7 +2991,7 @@ def print_snapshot_table(results: List[SnapshotResult]) -> None:
     if not results:
         return
 
-    print(f"\n{ICONS['list']} Snapshot breakdown:")
+    lines = [f"\n{ICONS['list']} Snapshot breakdown:"]
 
     col_snapshot = "Snapshot"
     col_unique = "Unique Size"
@@ -2189,71 +3003,60 @@ def print_snapshot_table(results: List[SnapshotResult]) -> None:
     w_shared = max(len(col_shared), max(len(human_readable_size(r.shared_bytes)) for r in results))
     w_total = max(len(col_total), max(len(human_readable_size(r.unique_bytes + r.shared_bytes)) for r in results))
 
-    print(
+    lines.append(
         f"  {col_snapshot.ljust(w_snapshot)}  "
         f"{col_unique.rjust(w_unique)}  "
         f"{col_shared.rjust(w_shared)}  "
         f"{col_total.rjust(w_total)}"
     )
     separator = "  " + "-" * w_snapshot + "  " + "-" * w_unique + "  " + "-" * w_shared + "  " + "-" * w_total
-    print(separator)
+    lines.append(separator)
 
     for result in results:
         name = result.snapshot_name
         unique_size = human_readable_size(result.unique_bytes)
         shared_size = human_readable_size(result.shared_bytes)
         total_size = human_readable_size(result.unique_bytes + result.shared_bytes)
-        print(
+        lines.append(
             f"  {name.ljust(w_snapshot)}  "
             f"{unique_size.rjust(w_unique)}  "
             f"{shared_size.rjust(w_shared)}  "
             f"{total_size.rjust(w_total)}"
         )
 
+    print("\n".join(lines))
+
 
 # =============================================================================
 # Datastore-wide guest discovery and confirmation
 # =============================================================================
 
 def discover_guest_paths(scan_root: Path) -> List[Path]:
-    """Return all VM/CT directories under the scan_root, including nested namespaces."""
+    """Return all VM/CT directories under the scan_root, including nested namespaces.
+
+    Symlinked guest and namespace directories are followed; guests are returned
+    resolved and listed once even when reachable through several links.
+    """
     guests: List[Path] = []
     seen: Set[Path] = set()
-
-    def _scan(base: Path) -> None:
+    seen_ns: Set[Path] = set()
+    pending = [scan_root]
+    while pending:
+        base = pending.pop()
+        resolved_base = base.resolve()
+        if resolved_base in seen_ns:
+            continue
+        seen_ns.add(resolved_base)
         for kind in ("vm", "ct"):
             kind_dir = base / kind
-            if not kind_dir.is_dir():
-                continue
-            try:
-                entries = sorted(
-                    (p for p in kind_dir.iterdir() if p.is_dir()),
-                    key=lambda item: item.name.lower(),
-                )
-            except PermissionError:
-                continue
-            for child in entries:
-                if child.name.startswith("."):
-                    continue
-                resolved = child.resolve()
+            for name in _list_subdirectories(kind_dir):
+                resolved = (kind_dir / name).resolve()
                 if resolved not in seen:
                     seen.add(resolved)
                     guests.append(resolved)
         ns_dir = base / "ns"
-        if ns_dir.is_dir():
-            try:
-                sub_ns = sorted(
-                    (p for p in ns_dir.iterdir() if p.is_dir()),
-                    key=lambda item: item.name.lower(),
-                )
-            except PermissionError:
-                sub_ns = []
-            for ns in sub_ns:
-                if ns.name.startswith("."):
-                    continue
-                _scan(ns)
-
-    _scan(scan_root)
+        # reversed so namespaces are visited in listing order
+        pending.extend(ns_dir / name for name in reversed(_list_subdirectories(ns_dir)))
     return guests
 
 
@@ -2361,6 +3164,26 @@ def _simplify_guest_comment(raw: str) -> str:
     return first
 
 
+def _prefetch_snapshot_lists(
+    datastore_name: str, datastore_root: Path, guest_paths: Sequence[Path]
+) -> None:
+    """Load the snapshot lists of all namespaces holding guest_paths concurrently.
+
+    Fills _SNAPSHOT_LIST_CACHE so later comment lookups do not wait on one
+    API call per namespace in turn.
+    """
+    namespaces: Set[str] = set()
+    for guest_path in guest_paths:
+        location = _extract_guest_location(datastore_root, guest_path)
+        if location is not None and (datastore_name, location[0]) not in _SNAPSHOT_LIST_CACHE:
+            namespaces.add(location[0])
+    if len(namespaces) < 2:
+        return
+    with futures.ThreadPoolExecutor(max_workers=min(8, len(namespaces))) as pool:
+        with _cancel_on_interrupt(pool):
+            list(pool.map(functools.partial(_load_snapshots_for_namespace, datastore_name), namespaces))
+
+
 def get_guest_comment_for_path(
     datastore_name: Optional[str],
     datastore_root: Path,
@@ -2641,73 +3464,94 @@ def run_full_datastore_scan(
     print(f"{ICONS['folder']} Scan root: {scope_label}")
     print(f"{ICONS['folder']} Guests to analyze: {len(guests)}")
 
-    overall_start = time.time()
+    overall_start = time.monotonic()
     results: List[Tuple[str, UsageResult]] = []
     snapshot_csv_rows = [] if csv_dir is not None and getattr(args, "per_snapshot", False) else None
     csv_rows = [] if csv_dir is not None else None
     total_guests = len(guests)
     per_snapshot = getattr(args, "per_snapshot", False)
 
-    for idx, guest_path in enumerate(guests, 1):
-        label = guest_labels[idx - 1]
-        print(f"\n{ICONS['folder']} [{idx}/{total_guests}] {label}")
-        guest_start = time.time()
-
-        if per_snapshot:
-            result, snapshot_results = analyze_guest_per_snapshot(
-                guest_path,
-                chunks_root,
-                args.threads,
-                timer_base=guest_start,
-                progress_label=f"{idx}/{total_guests} {label}",
-            )
-            if snapshot_csv_rows is not None:
-                for sr in snapshot_results:
-                    snapshot_csv_rows.append((
-                        label,
-                        sr.snapshot_name,
-                        sr.unique_bytes,
-                        sr.shared_bytes,
-                        sr.unique_bytes + sr.shared_bytes,
-                        sr.unique_chunks,
-                    ))
-        else:
-            result = analyze_search_path(
+    datastore_name = getattr(args, "datastore", None)
+    if datastore_name:
+        _prefetch_snapshot_lists(datastore_name, datastore_root, guests)
+
+    # Share the worker pools across guests instead of recreating them per guest.
+    # Deduplicated chunks are usually shared by many guests; their sizes are
+    # looked up once and reused for later guests.
+    size_cache: Dict[bytes, int] = {}
+    with contextlib.ExitStack() as stack:
+        stat_pool = stack.enter_context(
+            futures.ThreadPoolExecutor(max_workers=min(args.threads, _STAT_MAX_WORKERS))
+        )
+        parse_pool = None
+        if not per_snapshot:
+            parse_pool = stack.enter_context(futures.ThreadPoolExecutor(max_workers=args.threads))
+
+        for idx, guest_path in enumerate(guests, 1):
+            label = guest_labels[idx - 1]
+            print(f"\n{ICONS['folder']} [{idx}/{total_guests}] {label}")
+            guest_start = time.monotonic()
+
+            if per_snapshot:
+                result, snapshot_results = analyze_guest_per_snapshot(
+                    guest_path,
+                    chunks_root,
+                    args.threads,
+                    timer_base=guest_start,
+                    progress_label=f"{idx}/{total_guests} {label}",
+                    stat_pool=stat_pool,
+                    size_cache=size_cache,
+                )
+                if snapshot_csv_rows is not None:
+                    for sr in snapshot_results:
+                        snapshot_csv_rows.append((
+                            label,
+                            sr.snapshot_name,
+                            sr.unique_bytes,
+                            sr.shared_bytes,
+                            sr.unique_bytes + sr.shared_bytes,
+                            sr.unique_chunks,
+                        ))
+            else:
+                result = analyze_search_path(
+                    guest_path,
+                    chunks_root,
+                    args.threads,
+                    timer_base=guest_start,
+                    progress_label=f"{idx}/{total_guests} {label}",
+                    parse_pool=parse_pool,
+                    stat_pool=stat_pool,
+                    size_cache=size_cache,
+                )
+            summary_label = label
+            raw_comment = get_guest_comment_for_path(
+                datastore_name,
+                datastore_root,
                 guest_path,
-                chunks_root,
-                args.threads,
-                timer_base=guest_start,
-                progress_label=f"{idx}/{total_guests} {label}",
+                simplify=False,
             )
-        summary_label = label
-        raw_comment = get_guest_comment_for_path(
-            getattr(args, "datastore", None),
-            datastore_root,
-            guest_path,
-            simplify=False,
-        )
-        if getattr(args, "show_comments", False) and raw_comment:
-            simplified = _simplify_guest_comment(raw_comment)
-            if simplified:
-                summary_label = f"{label} ({simplified})"
-        if csv_rows is not None:
-            csv_rows.append((label, raw_comment or "", result.unique_bytes))
-        results.append((summary_label, result))
-        if result.index_files == 0:
-            print(f"{ICONS['info']} No index files (*.fidx/*.didx) found for {label}.")
-            continue
-        if result.unique_chunks == 0:
-            print(f"{ICONS['info']} No chunks referenced for {label}.")
-            continue
+            if getattr(args, "show_comments", False) and raw_comment:
+                simplified = _simplify_guest_comment(raw_comment)
+                if simplified:
+                    summary_label = f"{label} ({simplified})"
+            if csv_rows is not None:
+                csv_rows.append((label, raw_comment or "", result.unique_bytes))
+            results.append((summary_label, result))
+            if result.index_files == 0:
+                print(f"{ICONS['info']} No index files (*.fidx/*.didx) found for {label}.")
+                continue
+            if result.unique_chunks == 0:
+                print(f"{ICONS['info']} No chunks referenced for {label}.")
+                continue
 
-        print_usage_summary(result, time.time() - guest_start)
+            print_usage_summary(result, time.monotonic() - guest_start)
 
-        if per_snapshot and snapshot_results:
-            print_snapshot_table(snapshot_results)
+            if per_snapshot and snapshot_results:
+                print_snapshot_table(snapshot_results)
 
     print()
     print_full_datastore_summary(results)
-    total_elapsed = format_elapsed(time.time() - overall_start)
+    total_elapsed = format_elapsed(time.monotonic() - overall_start)
     print(f"{ICONS['timer']} Full datastore scan duration: {total_elapsed}")
     if csv_dir is not None and csv_rows is not None:
         try:
@@ -2783,7 +3627,7 @@ def _interactive_menu(args) -> Optional[Tuple[str, Optional[str], bool]]:
                     )
                     if ds is None:
                         continue
-                    if not DATASTORE_PATTERN.fullmatch(ds):
+                    if not is_valid_datastore_name(ds):
                         clear_console()
                         print(f"{ICONS['error']} Error: invalid datastore name '{ds}'.")
                         input("Press Enter to continue...")
@@ -2809,7 +3653,7 @@ def _interactive_menu(args) -> Optional[Tuple[str, Optional[str], bool]]:
                     ds = input("Enter datastore name: ").strip()
                     if not ds:
                         continue
-                    if not DATASTORE_PATTERN.fullmatch(ds):
+                    if not is_valid_datastore_name(ds):
                         clear_console()
                         print(f"{ICONS['error']} Error: invalid datastore name '{ds}'.")
                         input("Press Enter to continue...")
@@ -2847,13 +3691,10 @@ def _interactive_menu(args) -> Optional[Tuple[str, Optional[str], bool]]:
                 abs_selected = _choose_directory(datastore_path, datastore_name, args)
                 if abs_selected is None:
                     continue
-                rel = (
-                    "/"
-                    + str(Path(abs_selected).relative_to(datastore_path))
-                    if abs_selected != datastore_path
-                    else "/"
-                )
-                search_rel = rel
+                # the browser builds its result from Path(datastore_path), so the
+                # normalized root is always a prefix of abs_selected
+                root_prefix = str(Path(datastore_path))
+                search_rel = "/" + abs_selected[len(root_prefix):].lstrip("/")
 
             elif choice == "Start":
                 if datastore_name and search_rel:
@@ -3050,7 +3891,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             "or none for interactive mode."
         )
 
-    elif not DATASTORE_PATTERN.fullmatch(args.datastore or ""):
+    elif not is_valid_datastore_name(args.datastore or ""):
         sys.stderr.write(
             f"{ICONS['error']} Error: invalid datastore name '{args.datastore}'. "
             "Only letters, digits, '.', '_', and '-' are allowed.\n"
@@ -3058,7 +3899,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         return 1
 
     # ----- Start measuring total execution time -----
-    start_ts = time.time()
+    start_ts = time.monotonic()
 
     # ----- Resolve datastore and chunk directory paths -----
     try:
@@ -3123,7 +3964,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             return 0
 
         print()
-        print_usage_summary(result, time.time() - start_ts)
+        print_usage_summary(result, time.monotonic() - start_ts)
 
         if snapshot_results:
             print_snapshot_table(snapshot_results)
@@ -3132,7 +3973,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         if result.index_files == 0 or result.unique_chunks == 0:
             return 0
 
-        print_usage_summary(result, time.time() - start_ts)
+        print_usage_summary(result, time.monotonic() - start_ts)
 
     return 0
 
@@ -3142,5 +3983,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 # =============================================================================
 
 if __name__ == "__main__":
-    signal.signal(signal.SIGINT, lambda s, f: sys.exit(130))
-    sys.exit(main())
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        sys.exit(130)